@@ -0,0 +1,33 @@
+"""
+Numba kernels for deterministic (rule-based equality) matching
+Field values are interned to int64 codes up front so no strings reach the kernel.
+"""
+
+import numpy as np
+from numba import njit, prange
+
+# Code for a field that is absent, or a query value no candidate carries
+MISSING = -1
+
+@njit(cache=True, parallel=True)
+def match_rules(query_codes: np.ndarray, candidate_codes: np.ndarray, rules: np.ndarray) -> np.ndarray:
+    """
+    Evaluate equality rules for every candidate.
+    query_codes: (n_fields,), candidate_codes: (n_candidates, n_fields),
+    rules: (n_rules, n_fields) bool, True where the rule requires that field.
+    Returns (n_candidates, n_rules) bool: all required fields present and equal.
+    """
+    n_candidates, n_fields = candidate_codes.shape
+    n_rules = rules.shape[0]
+    out = np.zeros((n_candidates, n_rules), dtype=np.bool_)
+    
+    for i in prange(n_candidates):
+        for r in range(n_rules):
+            matched = True
+            for f in range(n_fields):
+                if rules[r, f] and (query_codes[f] == MISSING or candidate_codes[i, f] != query_codes[f]):
+                    matched = False
+                    break
+            out[i, r] = matched
+    
+    return out
@@ -0,0 +1,30 @@
+"""
+Indel distance via bit-parallel LCS (Hyyrö 2004).
+Pure-Python fallback used when RapidFuzz is not installed. Python integers are
+unbounded, so the whole pattern fits in a single bit-vector regardless of length.
+"""
+
+def indel_distance(s1: str, s2: str) -> int:
+    """
+    Indel (insertion/deletion only) distance between s1 and s2, i.e.
+    len(s1) + len(s2) - 2 * LCS. Mirrors RapidFuzz's Indel.distance.
+    """
+    if len(s1) > len(s2):
+        s1, s2 = s2, s1
+    
+    m = len(s1)
+    if m == 0:
+        return len(s2)
+    
+    peq = {}
+    for i, c in enumerate(s1):
+        peq[c] = peq.get(c, 0) | (1 << i)
+    
+    mask = (1 << m) - 1
+    s = mask
+    for c in s2:
+        u = s & peq.get(c, 0)
+        s = ((s + u) | (s - u)) & mask
+    
+    lcs = m - s.bit_count()
+    return len(s1) + len(s2) - 2 * lcs
@@ -0,0 +1,27 @@
+"""
+Numba kernels for probabilistic (weighted field agreement) scoring
+"""
+
+import numpy as np
+from numba import njit, prange
+
+@njit(cache=True, parallel=True, fastmath=True)
+def weighted_scores(similarity: np.ndarray, present: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    Weighted average of per-field similarities for each candidate row, normalized by
+    the weight of the fields present on both sides. Rows with no shared fields score 0.
+    """
+    n_candidates, n_fields = similarity.shape
+    scores = np.zeros(n_candidates)
+    
+    for i in prange(n_candidates):
+        total_score = 0.0
+        total_weight = 0.0
+        for j in range(n_fields):
+            if present[i, j]:
+                total_score += similarity[i, j] * weights[j]
+                total_weight += weights[j]
+        if total_weight > 0:
+            scores[i] = total_score / total_weight
+    
+    return scores
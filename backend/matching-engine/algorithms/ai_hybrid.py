@@ -25,6 +25,9 @@ from transformers import AutoTokenizer, AutoModel
 
 logger = logging.getLogger(__name__)
 
+_NON_DIGIT_RE = re.compile(r'\D')
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
 class MatchType(Enum):
     EXACT = "exact"
     DETERMINISTIC = "deterministic"
@@ -185,13 +188,12 @@ class DataQualityAssessor:
     def _validate_ssn_format(self, ssn: str) -> bool:
         """Validate SSN format"""
         # Remove all non-digits
-        digits = re.sub(r'\D', '', ssn)
+        digits = _NON_DIGIT_RE.sub('', ssn)
         return len(digits) == 9 or len(digits) == 4  # Full SSN or last 4
     
     def _validate_email_format(self, email: str) -> bool:
         """Validate email format"""
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return bool(re.match(pattern, email))
+        return bool(_EMAIL_RE.match(email))
 
 class AIHybridMatcher:
     """Advanced AI/ML hybrid matching system"""
@@ -282,6 +284,10 @@ class AIHybridMatcher:
             logger.error(f"Error in AI hybrid matching: {str(e)}")
             return []
     
+    async def match_batch(self, demographic_batch: List[Dict]) -> List[List[Dict]]:
+        """Match a micro-batch of queries; results are returned in query order"""
+        return [await self.match(demographic_data) for demographic_data in demographic_batch]
+    
     async def _get_candidate_matches(self, demographic_data: Dict) -> List[Dict]:
         """Get potential candidate matches from database"""
         # Mock implementation - in production, this would query the database
@@ -745,8 +751,8 @@ class AIHybridMatcher:
     
     def _calculate_phone_similarity(self, query: Dict, candidate: Dict) -> float:
         """Calculate phone similarity"""
-        q_phone = re.sub(r'\D', '', query.get('phone', ''))
-        c_phone = re.sub(r'\D', '', candidate.get('phone', ''))
+        q_phone = _NON_DIGIT_RE.sub('', query.get('phone', ''))
+        c_phone = _NON_DIGIT_RE.sub('', candidate.get('phone', ''))
         
         if not (q_phone and c_phone):
             return 0.0
@@ -0,0 +1,77 @@
+"""
+Candidate blocking for identity matching
+Restricts pairwise matchers to identities sharing at least one cheap blocking key
+(last name soundex, SSN last 4, birth year or phone prefix)
+"""
+
+from typing import Dict, Iterable, List, Optional, Set
+import re
+import numpy as np
+import phonetics
+
+from utils.cache import CacheManager
+
+# Key prefix of cached /api/v1/resolve results, which depend on the candidate pool
+RESOLVE_CACHE_PREFIX = "resolve:"
+
+_NON_DIGIT_RE = re.compile(r'\D')
+_NON_ALPHA_RE = re.compile(r'[^a-zA-Z]')
+
+def blocking_keys(record: Dict) -> List[str]:
+    """Build the blocking keys for a demographic record"""
+    keys = []
+    
+    last_name = _NON_ALPHA_RE.sub('', str(record.get('last_name') or ''))
+    if last_name:
+        keys.append(f"block:sndx:{phonetics.soundex(last_name)}")
+    
+    ssn_last4 = _NON_DIGIT_RE.sub('', str(record.get('ssn_last4') or record.get('ssn') or ''))[-4:]
+    if len(ssn_last4) == 4:
+        keys.append(f"block:ssn4:{ssn_last4}")
+    
+    dob_year = str(record.get('dob') or '')[:4]
+    if len(dob_year) == 4 and dob_year.isdigit():
+        keys.append(f"block:dob_yr:{dob_year}")
+    
+    # Area code + exchange of the national number
+    phone = _NON_DIGIT_RE.sub('', str(record.get('phone') or ''))[-10:]
+    if len(phone) == 10:
+        keys.append(f"block:phone:{phone[:6]}")
+    
+    return keys
+
+def candidate_rows(row_of_id: Dict[str, int], candidates: Optional[Set[str]]) -> Optional[np.ndarray]:
+    """
+    Translate a blocked candidate id set into sorted row indexes of a matcher's
+    identity columns, in O(|candidates|). None (no pruning) passes through.
+    """
+    if candidates is None:
+        return None
+    rows = [row_of_id[identity_id] for identity_id in candidates if identity_id in row_of_id]
+    return np.sort(np.array(rows, dtype=np.int32))
+
+class BlockingIndex:
+    """Inverted index from blocking key to identity ids, kept in the cache as sets"""
+    
+    def __init__(self, cache: CacheManager):
+        self.cache = cache
+    
+    async def add_identities(self, identities: Iterable[Dict]) -> None:
+        """
+        Register identities under each of their blocking keys. The candidate pool
+        changed, so cached resolve results are invalidated.
+        """
+        for identity in identities:
+            for key in blocking_keys(identity):
+                await self.cache.sadd(key, identity['identity_id'])
+        await self.cache.delete_prefix(RESOLVE_CACHE_PREFIX)
+    
+    async def collect_candidates(self, demographic_data: Dict) -> Optional[Set[str]]:
+        """
+        Union of identity ids sharing any blocking key with the query.
+        Returns None when the query has no blocking fields, meaning no pruning.
+        """
+        keys = blocking_keys(demographic_data)
+        if not keys:
+            return None
+        return await self.cache.sunion(keys)
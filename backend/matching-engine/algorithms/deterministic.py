@@ -1,6 +1,7 @@
 from typing import Dict, List, Optional
-import hashlib
-import json
+import numpy as np
+
+from algorithms._det_kernels import MISSING, match_rules
 
 class DeterministicMatcher:
     def __init__(self):
@@ -10,48 +11,76 @@ class DeterministicMatcher:
             ['phone', 'email'],
             ['first_name', 'last_name', 'address']
         ]
+        
+        # Kernel layout: exact fields compare verbatim, composite fields case-insensitively,
+        # so each gets its own column. One rule per exact field, then one per composite key.
+        composite_fields = list(dict.fromkeys(f for key_set in self.composite_keys for f in key_set))
+        self._columns = [(f, False) for f in self.exact_match_fields] + [(f, True) for f in composite_fields]
+        column_index = {column: j for j, column in enumerate(self._columns)}
+        
+        self._rules = np.zeros((len(self.exact_match_fields) + len(self.composite_keys), len(self._columns)), dtype=np.bool_)
+        for r, field in enumerate(self.exact_match_fields):
+            self._rules[r, column_index[(field, False)]] = True
+        for r, key_set in enumerate(self.composite_keys, start=len(self.exact_match_fields)):
+            for field in key_set:
+                self._rules[r, column_index[(field, True)]] = True
+        
+        # Candidate pool interned once into per-column value -> code tables
+        self._identities = self._get_mock_identities()
+        self._codebooks = [{} for _ in self._columns]
+        self._candidate_codes = np.full((len(self._identities), len(self._columns)), MISSING, dtype=np.int64)
+        for i, identity in enumerate(self._identities):
+            for j, (field, folded) in enumerate(self._columns):
+                if field in identity:
+                    key = self._column_key(identity[field], folded)
+                    self._candidate_codes[i, j] = self._codebooks[j].setdefault(key, len(self._codebooks[j]))
     
     async def match(self, demographic_data: Dict) -> List[Dict]:
         matches = []
         
-        # Mock database of existing identities
-        mock_identities = self._get_mock_identities()
+        query_codes = np.array([
+            self._codebooks[j].get(self._column_key(demographic_data[field], folded), MISSING)
+            if field in demographic_data else MISSING
+            for j, (field, folded) in enumerate(self._columns)
+        ], dtype=np.int64)
         
-        for identity in mock_identities:
-            # Check exact field matches
-            for field in self.exact_match_fields:
-                if field in demographic_data and field in identity:
-                    if demographic_data[field] == identity[field]:
-                        matches.append({
-                            'identity_id': identity['identity_id'],
-                            'confidence_score': 1.0,
-                            'match_type': 'deterministic_exact',
-                            'matched_fields': [field],
-                            'matched_systems': identity.get('systems', [])
-                        })
-                        break
+        rule_hits = match_rules(query_codes, self._candidate_codes, self._rules)
+        n_exact = len(self.exact_match_fields)
+        
+        for i in np.flatnonzero(rule_hits.any(axis=1)):
+            identity = self._identities[i]
+            exact_hits = np.flatnonzero(rule_hits[i, :n_exact])
+            composite_hits = np.flatnonzero(rule_hits[i, n_exact:])
+            
+            # First matching exact field
+            if exact_hits.size:
+                matches.append({
+                    'identity_id': identity['identity_id'],
+                    'confidence_score': 1.0,
+                    'match_type': 'deterministic_exact',
+                    'matched_fields': [self.exact_match_fields[exact_hits[0]]],
+                    'matched_systems': identity.get('systems', [])
+                })
             
-            # Check composite key matches
-            for key_set in self.composite_keys:
-                if self._check_composite_match(demographic_data, identity, key_set):
-                    matches.append({
-                        'identity_id': identity['identity_id'],
-                        'confidence_score': 0.95,
-                        'match_type': 'deterministic_composite',
-                        'matched_fields': key_set,
-                        'matched_systems': identity.get('systems', [])
-                    })
-                    break
+            # First matching composite key
+            if composite_hits.size:
+                matches.append({
+                    'identity_id': identity['identity_id'],
+                    'confidence_score': 0.95,
+                    'match_type': 'deterministic_composite',
+                    'matched_fields': self.composite_keys[composite_hits[0]],
+                    'matched_systems': identity.get('systems', [])
+                })
         
         return matches
     
-    def _check_composite_match(self, data1: Dict, data2: Dict, fields: List[str]) -> bool:
-        for field in fields:
-            if field not in data1 or field not in data2:
-                return False
-            if str(data1[field]).lower() != str(data2[field]).lower():
-                return False
-        return True
+    async def match_batch(self, demographic_batch: List[Dict]) -> List[List[Dict]]:
+        """Match a micro-batch of queries; results are returned in query order"""
+        return [await self.match(demographic_data) for demographic_data in demographic_batch]
+    
+    def _column_key(self, value, folded: bool):
+        # Composite keys compare str(value) case-insensitively; exact fields compare the value itself
+        return str(value).lower() if folded else value
     
     def _get_mock_identities(self) -> List[Dict]:
         # Mock database of identities for demo
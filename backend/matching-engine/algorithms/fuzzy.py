@@ -1,52 +1,178 @@
-from typing import Dict, List
+from typing import Dict, List, Optional, Set
+from functools import lru_cache
 from fuzzywuzzy import fuzz
+import numpy as np
 import re
 
+from algorithms.blocking import candidate_rows
+
+# Name scores are fuzz.ratio (normalized Indel similarity, rounded to an int), the metric
+# the 80 threshold was tuned for. RapidFuzz's SIMD Indel (and batched cdist) when
+# available, otherwise the in-repo bit-parallel LCS with per-pair scoring
+try:
+    from rapidfuzz import process as rf_process
+    from rapidfuzz.distance import Indel
+    from rapidfuzz.distance.Indel import distance as indel_distance
+except ImportError:
+    rf_process = None
+    from algorithms._myers import indel_distance
+
+_NON_ALNUM_RE = re.compile(r'[^a-zA-Z0-9\s]')
+_NON_DIGIT_RE = re.compile(r'\D')
+
+@lru_cache(maxsize=4096)
+def _charset_mask(s: str) -> int:
+    """Character-set bitmask of a normalized string (bit ord(c) set for each character)"""
+    mask = 0
+    for c in s:
+        mask |= 1 << ord(c)
+    return mask
+
 class FuzzyMatcher:
     def __init__(self):
         self.fuzzy_threshold = 80  # Fuzzy matching threshold (0-100)
+        self.distance = indel_distance
+        
+        # Candidate pool and its normalized name columns, prepared once for cdist
+        self._identities = self._get_mock_identities()
+        self._first_names = [self._normalize_string(i.get('first_name', '')) for i in self._identities]
+        self._last_names = [self._normalize_string(i.get('last_name', '')) for i in self._identities]
+        self._has_first = np.array(['first_name' in i for i in self._identities])
+        self._has_last = np.array(['last_name' in i for i in self._identities])
+        self._row_of_id = {identity['identity_id']: row for row, identity in enumerate(self._identities)}
     
-    async def match(self, demographic_data: Dict) -> List[Dict]:
+    async def match(self, demographic_data: Dict, candidates: Optional[Set[str]] = None) -> List[Dict]:
         matches = []
         
-        # Mock database of existing identities
-        mock_identities = self._get_mock_identities()
+        # Only score identities that survived blocking
+        rows = candidate_rows(self._row_of_id, candidates)
+        mock_identities = self._identities if rows is None else [self._identities[r] for r in rows]
         
         for identity in mock_identities:
-            fuzzy_score = self._calculate_fuzzy_score(demographic_data, identity)
+            fuzzy_score = self._calculate_fuzzy_score(demographic_data, identity, cutoff=self.fuzzy_threshold)
             
             if fuzzy_score >= self.fuzzy_threshold:
-                confidence = fuzzy_score / 100.0 * 0.85  # Max 0.85 confidence for fuzzy
-                matches.append({
-                    'identity_id': identity['identity_id'],
-                    'confidence_score': confidence,
-                    'match_type': 'fuzzy',
-                    'match_details': {
-                        'fuzzy_score': fuzzy_score,
-                        'algorithm': 'levenshtein_fuzzy'
-                    },
-                    'matched_systems': identity.get('systems', [])
-                })
+                matches.append(self._build_match(identity, fuzzy_score))
         
         return matches
     
-    def _calculate_fuzzy_score(self, data1: Dict, data2: Dict) -> float:
-        scores = []
+    def _build_match(self, identity: Dict, fuzzy_score: float) -> Dict:
+        confidence = fuzzy_score / 100.0 * 0.85  # Max 0.85 confidence for fuzzy
+        return {
+            'identity_id': identity['identity_id'],
+            'confidence_score': confidence,
+            'match_type': 'fuzzy',
+            'match_details': {
+                'fuzzy_score': fuzzy_score,
+                'algorithm': 'levenshtein_fuzzy'
+            },
+            'matched_systems': identity.get('systems', [])
+        }
+    
+    async def match_batch(self, demographic_batch: List[Dict],
+                          candidates_batch: Optional[List[Optional[Set[str]]]] = None) -> List[List[Dict]]:
+        """Match a micro-batch of queries; results are returned in query order"""
+        if candidates_batch is None:
+            candidates_batch = [None] * len(demographic_batch)
+        if rf_process is None or not demographic_batch:
+            return [
+                await self.match(demographic_data, candidates=candidates)
+                for demographic_data, candidates in zip(demographic_batch, candidates_batch)
+            ]
+        return self._match_batch_cdist(demographic_batch, candidates_batch)
+    
+    def _match_batch_cdist(self, demographic_batch: List[Dict],
+                           candidates_batch: List[Optional[Set[str]]]) -> List[List[Dict]]:
+        # Score only the union of the batch's blocked candidates; any unblocked query needs the full pool
+        rows_batch = [candidate_rows(self._row_of_id, candidates) for candidates in candidates_batch]
+        if any(rows is None for rows in rows_batch):
+            pool = np.arange(len(self._identities))
+        else:
+            pool = np.unique(np.concatenate(rows_batch))
+        if not len(pool):
+            return [[] for _ in demographic_batch]
+        
+        # Name similarity for every (query, pooled candidate) pair in one native cdist call per column
+        first_sim = self._ratio_matrix(
+            [self._normalize_string(d.get('first_name', '')) for d in demographic_batch],
+            [self._first_names[r] for r in pool]
+        )
+        last_sim = self._ratio_matrix(
+            [self._normalize_string(d.get('last_name', '')) for d in demographic_batch],
+            [self._last_names[r] for r in pool]
+        )
+        
+        # A name component counts only when both sides carry the field
+        has_first = np.array(['first_name' in d for d in demographic_batch])[:, None] & self._has_first[pool]
+        has_last = np.array(['last_name' in d for d in demographic_batch])[:, None] & self._has_last[pool]
+        totals = np.where(has_first, first_sim, 0.0) + np.where(has_last, last_sim * 1.2, 0.0)  # Last name more important
+        counts = has_first.astype(np.float64) + has_last
+        
+        # Each query may only match its own block within the pool
+        allowed = np.zeros(totals.shape, dtype=bool)
+        for q, rows in enumerate(rows_batch):
+            if rows is None:
+                allowed[q] = True
+            else:
+                allowed[q, np.searchsorted(pool, rows)] = True
+        
+        # Address and phone components stay pairwise; they only apply when both sides have them
+        for q, c in np.argwhere(allowed):
+            contact_scores = self._contact_scores(demographic_batch[q], self._identities[pool[c]])
+            totals[q, c] += sum(contact_scores)
+            counts[q, c] += len(contact_scores)
+        
+        scores = np.divide(totals, counts, out=np.zeros_like(totals), where=counts > 0)
+        
+        results = [[] for _ in demographic_batch]
+        for q, c in np.argwhere(allowed & (scores >= self.fuzzy_threshold)):
+            results[q].append(self._build_match(self._identities[pool[c]], float(scores[q, c])))
+        return results
+    
+    @staticmethod
+    def _ratio_matrix(queries: List[str], choices: List[str]) -> np.ndarray:
+        """_ratio_score for every (query, choice) pair in one native cdist call"""
+        similarities = rf_process.cdist(
+            queries, choices, scorer=Indel.normalized_similarity, dtype=np.float64, workers=-1
+        )
+        return np.rint(similarities * 100)
+    
+    def _calculate_fuzzy_score(self, data1: Dict, data2: Dict, cutoff: float = 0) -> float:
+        names = []  # (normalized1, normalized2, weight), scored last
         
         # Name fuzzy matching
         if 'first_name' in data1 and 'first_name' in data2:
-            first_name_score = fuzz.ratio(
+            names.append((
                 self._normalize_string(data1['first_name']),
-                self._normalize_string(data2['first_name'])
-            )
-            scores.append(first_name_score)
+                self._normalize_string(data2['first_name']),
+                1.0
+            ))
         
         if 'last_name' in data1 and 'last_name' in data2:
-            last_name_score = fuzz.ratio(
+            names.append((
                 self._normalize_string(data1['last_name']),
-                self._normalize_string(data2['last_name'])
-            )
-            scores.append(last_name_score * 1.2)  # Last name more important
+                self._normalize_string(data2['last_name']),
+                1.2  # Last name more important
+            ))
+        
+        scores = self._contact_scores(data1, data2)
+        
+        count = len(scores) + len(names)
+        if not count:
+            return 0
+        
+        # Prefilter: best case with each name at its similarity upper bound.
+        # If even that misses the cutoff, skip the edit-distance calls entirely.
+        if cutoff and names:
+            best_case = sum(scores) + sum(self._ratio_score_bound(a, b) * w for a, b, w in names)
+            if best_case / count < cutoff:
+                return 0
+        
+        scores.extend(self._ratio_score(a, b) * w for a, b, w in names)
+        return sum(scores) / count
+    
+    def _contact_scores(self, data1: Dict, data2: Dict) -> List[float]:
+        scores = []
         
         # Address fuzzy matching
         if 'address' in data1 and 'address' in data2:
@@ -66,17 +192,38 @@ class FuzzyMatcher:
                 if phone1[-7:] == phone2[-7:]:  # Same last 7 digits
                     scores.append(90)
         
-        if scores:
-            return sum(scores) / len(scores)
-        return 0
+        return scores
+    
+    def _ratio_score_bound(self, s1: str, s2: str) -> int:
+        # Upper bound on _ratio_score from a lower bound on the Indel distance: the length
+        # difference, and one deletion/insertion per distinct character the other side lacks.
+        # Rounded the same way, which keeps it an upper bound on the rounded score
+        total = len(s1) + len(s2)
+        if total == 0:
+            return 100
+        mask1 = _charset_mask(s1)
+        mask2 = _charset_mask(s2)
+        lower_bound = max(
+            abs(len(s1) - len(s2)),
+            (mask1 & ~mask2).bit_count() + (mask2 & ~mask1).bit_count()
+        )
+        return round(100 * (1 - lower_bound / total))
+    
+    def _ratio_score(self, s1: str, s2: str) -> int:
+        # fuzz.ratio: normalized Indel similarity on a 0-100 scale, rounded half-to-even to
+        # an int as fuzzywuzzy's python-Levenshtein backend does
+        total = len(s1) + len(s2)
+        if total == 0:
+            return 100
+        return round(100 * (1 - self.distance(s1, s2) / total))
     
     def _normalize_string(self, s: str) -> str:
         # Remove special characters and convert to lowercase
-        return re.sub(r'[^a-zA-Z0-9\s]', '', str(s).lower()).strip()
+        return _NON_ALNUM_RE.sub('', str(s).lower()).strip()
     
     def _normalize_phone(self, phone: str) -> str:
         # Remove all non-digit characters
-        return re.sub(r'\D', '', str(phone))
+        return _NON_DIGIT_RE.sub('', str(phone))
     
     def _normalize_address(self, address: Dict) -> str:
         if isinstance(address, dict):
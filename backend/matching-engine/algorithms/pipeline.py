@@ -0,0 +1,82 @@
+"""
+Matcher pipeline for worker processes
+Runs the deterministic, probabilistic, fuzzy and AI hybrid matchers plus ML enhancement
+over a micro-batch of queries, synchronously, so it can be dispatched to a
+ProcessPoolExecutor outside the event loop
+"""
+
+from typing import Dict, List, Optional, Set
+import asyncio
+import logging
+
+from algorithms.deterministic import DeterministicMatcher
+from algorithms.probabilistic import ProbabilisticMatcher
+from algorithms.ml_enhanced import MLEnhancedMatcher
+from algorithms.fuzzy import FuzzyMatcher
+from algorithms.ai_hybrid import AIHybridMatcher
+
+logger = logging.getLogger(__name__)
+
+# Per-process matcher singletons, built once by init_matchers
+_matchers: Optional[Dict] = None
+
+def init_matchers() -> None:
+    """Executor initializer: construct the matchers once per worker process"""
+    global _matchers
+    _matchers = {
+        'deterministic': DeterministicMatcher(),
+        'probabilistic': ProbabilisticMatcher(),
+        'fuzzy': FuzzyMatcher(),
+        'ai_hybrid': AIHybridMatcher(),
+        'ml': MLEnhancedMatcher()
+    }
+
+def run_matchers_batch(demo_batch: List[Dict], candidates_batch: List[Optional[Set[str]]],
+                       use_ml: bool) -> List[List[Dict]]:
+    """Run the matcher chain for a micro-batch and return each query's raw (unfiltered) matches"""
+    if _matchers is None:
+        init_matchers()
+    return asyncio.run(_match_batch(demo_batch, candidates_batch, use_ml))
+
+async def _no_matches(count: int) -> List[List[Dict]]:
+    return [[] for _ in range(count)]
+
+async def _match_batch(demo_batch: List[Dict], candidates_batch: List[Optional[Set[str]]],
+                       use_ml: bool) -> List[List[Dict]]:
+    # Deterministic matching first: a conclusive hit (>= 0.95) makes probabilistic matching moot
+    det_results = await _matchers['deterministic'].match_batch(demo_batch)
+    pending = [
+        i for i, det_matches in enumerate(det_results)
+        if not det_matches or max(m['confidence_score'] for m in det_matches) < 0.95
+    ]
+    
+    # The remaining matchers are independent; run their batched calls concurrently
+    pending_prob_results, fuzzy_results, ai_results = await asyncio.gather(
+        _matchers['probabilistic'].match_batch(
+            [demo_batch[i] for i in pending],
+            [candidates_batch[i] for i in pending]
+        ),
+        _matchers['fuzzy'].match_batch(demo_batch, candidates_batch),
+        _matchers['ai_hybrid'].match_batch(demo_batch) if use_ml else _no_matches(len(demo_batch))
+    )
+    
+    prob_results = [[] for _ in demo_batch]
+    for i, prob_matches in zip(pending, pending_prob_results):
+        prob_results[i] = prob_matches
+    
+    results = []
+    for demo_data, det_matches, prob_matches, fuzzy_matches, ai_matches in zip(
+        demo_batch, det_results, prob_results, fuzzy_results, ai_results
+    ):
+        matches = det_matches + prob_matches + fuzzy_matches
+        
+        if use_ml:
+            matches.extend(ai_matches)
+            
+            # Apply ML enhancement once over the merged matches (padded, fixed-shape batches)
+            matches = await _matchers['ml'].enhance_matches(demo_data, matches)
+        
+        results.append(matches)
+    
+    logger.info(f"Matched batch of {len(demo_batch)} queries")
+    return results
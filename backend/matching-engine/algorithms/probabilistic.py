@@ -1,6 +1,10 @@
-from typing import Dict, List
+from typing import Dict, List, Optional, Set
 import difflib
 from datetime import datetime
+import numpy as np
+
+from algorithms._prob_kernels import weighted_scores
+from algorithms.blocking import candidate_rows
 
 class ProbabilisticMatcher:
     def __init__(self):
@@ -14,16 +18,23 @@ class ProbabilisticMatcher:
             'email': 0.05
         }
         self.threshold = 0.75
+        self._fields = list(self.field_weights)
+        self._weights = np.array([self.field_weights[f] for f in self._fields])
+        
+        # Mock database of existing identities, loaded once and addressable by row
+        self._identities = self._get_mock_identities()
+        self._row_of_id = {identity['identity_id']: row for row, identity in enumerate(self._identities)}
     
-    async def match(self, demographic_data: Dict) -> List[Dict]:
+    async def match(self, demographic_data: Dict, candidates: Optional[Set[str]] = None) -> List[Dict]:
         matches = []
         
-        # Mock database of existing identities
-        mock_identities = self._get_mock_identities()
+        # Only score identities that survived blocking
+        rows = candidate_rows(self._row_of_id, candidates)
+        mock_identities = self._identities if rows is None else [self._identities[r] for r in rows]
+        
+        scores = self._calculate_probability_scores(demographic_data, mock_identities)
         
-        for identity in mock_identities:
-            score = self._calculate_probability_score(demographic_data, identity)
-            
+        for identity, score in zip(mock_identities, scores.tolist()):
             if score >= self.threshold:
                 matches.append({
                     'identity_id': identity['identity_id'],
@@ -38,24 +49,33 @@ class ProbabilisticMatcher:
         
         return matches
     
-    def _calculate_probability_score(self, data1: Dict, data2: Dict) -> float:
-        total_score = 0.0
-        total_weight = 0.0
+    async def match_batch(self, demographic_batch: List[Dict],
+                          candidates_batch: Optional[List[Optional[Set[str]]]] = None) -> List[List[Dict]]:
+        """Match a micro-batch of queries; results are returned in query order"""
+        if candidates_batch is None:
+            candidates_batch = [None] * len(demographic_batch)
+        return [
+            await self.match(demographic_data, candidates=candidates)
+            for demographic_data, candidates in zip(demographic_batch, candidates_batch)
+        ]
+    
+    def _calculate_probability_scores(self, data: Dict, identities: List[Dict]) -> np.ndarray:
+        # Build the (candidate x field) similarity matrix, then aggregate in a compiled kernel
+        similarity = np.zeros((len(identities), len(self._fields)))
+        present = np.zeros((len(identities), len(self._fields)), dtype=np.bool_)
         
-        for field, weight in self.field_weights.items():
-            if field in data1 and field in data2:
-                similarity = self._calculate_field_similarity(
-                    str(data1[field]), 
-                    str(data2[field]),
-                    field
-                )
-                total_score += similarity * weight
-                total_weight += weight
+        for i, identity in enumerate(identities):
+            for j, field in enumerate(self._fields):
+                if field in data and field in identity:
+                    similarity[i, j] = self._calculate_field_similarity(
+                        str(data[field]),
+                        str(identity[field]),
+                        field
+                    )
+                    present[i, j] = True
         
         # Normalize score based on available fields
-        if total_weight > 0:
-            return total_score / total_weight
-        return 0.0
+        return weighted_scores(similarity, present, self._weights)
     
     def _calculate_field_similarity(self, value1: str, value2: str, field_type: str) -> float:
         if field_type == 'dob':
@@ -1,20 +1,34 @@
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import FastAPI, HTTPException, Depends, Query, Request, status
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any, Union
-from datetime import datetime
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator
+from typing import Any, Callable, Dict, Hashable, List, Literal, Optional, Union
+from datetime import date, datetime, time as dt_time, timezone
+from concurrent.futures import ProcessPoolExecutor
+import dataclasses
+import itertools
+import operator
+import asyncio
+import time
 import uvicorn
 import os
+import re
+import hashlib
+import uuid
+import orjson
+import numpy as np
 from dotenv import load_dotenv
 
-from algorithms.deterministic import DeterministicMatcher
 from algorithms.probabilistic import ProbabilisticMatcher
-from algorithms.ml_enhanced import MLEnhancedMatcher
 from algorithms.fuzzy import FuzzyMatcher
-from algorithms.ai_hybrid import AIHybridMatcher
+from algorithms.blocking import BlockingIndex, RESOLVE_CACHE_PREFIX
+from algorithms.pipeline import init_matchers, run_matchers_batch
 from utils.database import DatabaseConnection
 from utils.cache import CacheManager
+from utils.batching import MicroBatcher
+from utils.response_cache import ResponseCache, CachePolicy, SHORT, NORMAL, LONG, ORJSON_OPTIONS
 from utils.logger import setup_logger
 
 # Import advanced services
@@ -22,7 +36,7 @@ from services.security_service import SecurityService, PrivacyService, Complianc
 from services.admin_service import AdminService
 from services.data_quality_service import DataQualityService
 from services.reporting_service import ReportGenerator
-from services.realtime_processor import RealTimeProcessor
+from services.realtime_processor import RealTimeProcessor, ProcessingPriority, ProcessingRequest
 from services.household_services import HouseholdDetector
 from services.batch_processing_service import BatchProcessingService, JobType, JobPriority, JobStatus
 from services.data_source_service import DataSourceService, DataSourceConfig, DataSourceType, FileFormat
@@ -36,7 +50,8 @@ app = FastAPI(
     description="Enterprise-Grade Identity Cross-Resolution System with AI/ML, Real-time Processing, and Comprehensive Security",
     version="2.1.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # CORS configuration
@@ -48,17 +63,39 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Reports, audit logs and transformed datasets are large JSON; small bodies aren't worth compressing
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Initialize components
 logger = setup_logger("matching_engine")
 db = DatabaseConnection()
 cache = CacheManager()
+response_cache = ResponseCache(cache)
 
-# Initialize matchers
-deterministic_matcher = DeterministicMatcher()
+# Matchers run in worker processes (see algorithms.pipeline); the probabilistic and
+# fuzzy instances here only supply candidate pools for the blocking index
 probabilistic_matcher = ProbabilisticMatcher()
-ml_matcher = MLEnhancedMatcher()
 fuzzy_matcher = FuzzyMatcher()
-ai_hybrid_matcher = AIHybridMatcher()
+blocking_index = BlockingIndex(cache)
+matcher_executor: Optional[ProcessPoolExecutor] = None
+
+async def _resolve_batch(use_ml: bool, items: List) -> List[List[Dict]]:
+    """Run one micro-batch of resolve queries through the matchers, off the event loop and the GIL"""
+    demo_batch = [demo_data for demo_data, _ in items]
+    candidates_batch = [candidates for _, candidates in items]
+    return await asyncio.get_running_loop().run_in_executor(
+        matcher_executor, run_matchers_batch, demo_batch, candidates_batch, use_ml
+    )
+
+# Concurrent /api/v1/resolve requests sharing a use_ml flag are matched together
+resolve_batcher = MicroBatcher(
+    _resolve_batch,
+    max_batch=int(os.getenv("RESOLVE_MAX_BATCH", 48)),
+    window_ms=float(os.getenv("RESOLVE_BATCH_WINDOW_MS", 10))
+)
+
+# Fire-and-forget tasks (e.g. statistics updates) kept alive until they complete
+_background_tasks = set()
 
 # Initialize advanced services
 security_service = SecurityService()
@@ -74,8 +111,59 @@ data_source_service = DataSourceService()
 output_format_service = OutputFormatService()
 data_transformation_service = DataTransformationService()
 
+# Per-field normalization applied once per request so matchers don't each redo it.
+# Whitespace is already stripped by DemographicData. Phone and full SSN keep their
+# formatting: deterministic matching compares them verbatim.
+_NON_DIGIT_RE = re.compile(r'\D+')
+_NORMALIZE = {
+    'ssn_last4': lambda s: _NON_DIGIT_RE.sub('', s),
+    'driver_license': str.upper,
+    'email': str.lower,
+}
+
+# Fields every matcher compares case-insensitively, so they are folded in resolve cache keys
+_CASE_FOLDED_FIELDS = {'first_name', 'last_name', 'middle_name'}
+
+# Below this many matches the pure-Python dedup + sort beats NumPy's setup cost
+TOPK_NUMPY_MIN_MATCHES = 32
+
+# Valid enum values, checked by set membership instead of constructing the enum
+# and catching ValueError
+_VALID_JOB_TYPES = frozenset(job_type.value for job_type in JobType)
+_VALID_JOB_PRIORITIES = frozenset(priority.value for priority in JobPriority)
+_VALID_JOB_STATUSES = frozenset(job_status.value for job_status in JobStatus)
+_VALID_SOURCE_TYPES = frozenset(source_type.value for source_type in DataSourceType)
+_VALID_FILE_FORMATS = frozenset(file_format.value for file_format in FileFormat)
+_VALID_OUTPUT_FORMATS = frozenset(output_format.value for output_format in OutputFormat)
+
+# Admin read endpoints are polled by the UI; serve them from short-lived cached payloads
+ADMIN_USERS_CACHE_PREFIX = "admin:users:"
+ADMIN_USERS_POLICY = CachePolicy(min_ttl=30, max_ttl=30)
+ADMIN_DASHBOARD_POLICY = CachePolicy(min_ttl=60, max_ttl=60)
+ADMIN_DIAGNOSTICS_POLICY = CachePolicy(min_ttl=10, max_ttl=10)
+
+# Read-only reports are cached per policy tier and fall back to the last report if
+# the reporting backend fails; enum listings only change on deploy
+REPORT_CACHE_PREFIX = "reports:"
+# Tag of every cached report; data mutations invalidate it
+REPORTS_TAG = "reports"
+# Dashboards tolerate slight staleness: past freshness they are served from cache while
+# a single background task rebuilds them
+REPORT_POLICY = dataclasses.replace(LONG, fallback=True, stale_while_revalidate=300)
+MATCHING_REPORT_POLICY = dataclasses.replace(NORMAL, fallback=True)
+
+# Largest client-supplied batch accepted by /api/v1/resolve/batch
+MAX_RESOLVE_BATCH = 100
+
+# Paginated batch results are capped; bulk reads go through the NDJSON stream endpoint
+MAX_RESULTS_PAGE_SIZE = 10000
+MAX_AUDIT_PAGE_SIZE = 5000
+
 # Request/Response Models
 class DemographicData(BaseModel):
+    # Whitespace is stripped during validation; unknown fields are rejected up front
+    model_config = ConfigDict(str_strip_whitespace=True, extra='forbid', frozen=True)
+    
     first_name: Optional[str] = Field(None, description="First name")
     last_name: Optional[str] = Field(None, description="Last name")
     middle_name: Optional[str] = Field(None, description="Middle name")
@@ -94,6 +182,35 @@ class IdentityResolutionRequest(BaseModel):
     match_threshold: float = Field(0.85, description="Minimum confidence threshold")
     use_ml: bool = Field(True, description="Use ML-enhanced matching")
 
+async def parse_resolution_request(request: Request) -> IdentityResolutionRequest:
+    """
+    Validate the raw body straight from JSON in pydantic-core, skipping FastAPI's
+    json.loads + dict validation round trip
+    """
+    try:
+        return IdentityResolutionRequest.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**error, 'loc': ('body', *error['loc'])} for error in e.errors(include_url=False)]
+        )
+
+def _inline_json_schema(model: type) -> Dict[str, Any]:
+    """JSON schema of a model with its nested definitions inlined, for openapi_extra"""
+    schema = model.model_json_schema()
+    definitions = schema.pop('$defs', {})
+    
+    def resolve(node):
+        if isinstance(node, dict):
+            ref = node.get('$ref')
+            if ref and ref.startswith('#/$defs/'):
+                return resolve(definitions[ref[len('#/$defs/'):]])
+            return {key: resolve(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [resolve(item) for item in node]
+        return node
+    
+    return resolve(schema)
+
 class MatchResult(BaseModel):
     identity_id: str
     confidence_score: float
@@ -108,6 +225,40 @@ class IdentityResolutionResponse(BaseModel):
     processing_time_ms: int
     timestamp: str
 
+@app.on_event("startup")
+async def open_database_pool():
+    await db.initialize_connection_pool()
+
+@app.on_event("shutdown")
+async def close_database_pool():
+    await db.close_connection_pool()
+
+@app.on_event("startup")
+async def start_matcher_executor():
+    """Start the matcher worker pool; each worker builds its own matcher singletons"""
+    global matcher_executor
+    matcher_executor = ProcessPoolExecutor(
+        # Split the cores between the web workers so N workers don't each claim all of them
+        max_workers=int(os.getenv("MATCHER_PROCESSES", max(1, (os.cpu_count() or 1) // serving_worker_count()))),
+        initializer=init_matchers
+    )
+
+@app.on_event("startup")
+async def start_resolve_batcher():
+    resolve_batcher.start()
+
+@app.on_event("shutdown")
+async def stop_matcher_executor():
+    await resolve_batcher.stop()
+    if matcher_executor:
+        matcher_executor.shutdown(wait=False, cancel_futures=True)
+
+@app.on_event("startup")
+async def build_blocking_index():
+    """Index the candidate pools of the pairwise matchers by blocking key"""
+    await blocking_index.add_identities(probabilistic_matcher._get_mock_identities())
+    await blocking_index.add_identities(fuzzy_matcher._get_mock_identities())
+
 # API Endpoints
 @app.get("/")
 async def root():
@@ -124,7 +275,7 @@ async def root():
             "Comprehensive Reporting",
             "Compliance Management"
         ],
-        "timestamp": datetime.utcnow().isoformat() + "Z"
+        "timestamp": utc_timestamp()
     }
 
 @app.get("/health")
@@ -143,110 +294,177 @@ async def health_check():
                 "cache": "healthy" if cache_status else "unhealthy",
                 "matching_engine": "healthy"
             },
-            "timestamp": datetime.utcnow().isoformat() + "Z"
+            "timestamp": utc_timestamp()
         }
     except Exception as e:
-        logger.error(f"Health check failed: {str(e)}")
-        return JSONResponse(
+        logger.exception("Health check failed: %s", e)
+        return ORJSONResponse(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            content={"status": "unhealthy", "error": str(e)}
+            content={"status": "unhealthy", "error": "Health check failed"}
         )
 
-@app.post("/api/v1/resolve", response_model=IdentityResolutionResponse)
-async def resolve_identity(request: IdentityResolutionRequest):
+@app.post(
+    "/api/v1/resolve",
+    responses={200: {"model": IdentityResolutionResponse}},
+    openapi_extra={"requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": _inline_json_schema(IdentityResolutionRequest)}}
+    }}
+)
+async def resolve_identity(request: IdentityResolutionRequest = Depends(parse_resolution_request)):
     """
     Resolve identity based on provided demographic data
     """
-    start_time = datetime.utcnow()
+    start_ns = time.perf_counter_ns()
     
     try:
-        # Cache disabled for demo
-        # cache_key = f"identity:{request.transaction_id}"
-        # cached_result = await cache.get(cache_key)
-        # 
-        # if cached_result:
-        #     logger.info(f"Cache hit for transaction {request.transaction_id}")
-        #     return cached_result
-        
         # Prepare demographic data
-        demo_data = request.demographic_data.dict(exclude_none=True)
-        
-        # Run matching algorithms
-        matches = []
-        
-        # 1. Try deterministic matching first
-        det_matches = await deterministic_matcher.match(demo_data)
-        if det_matches:
-            matches.extend(det_matches)
-            logger.info(f"Found {len(det_matches)} deterministic matches")
-        
-        # 2. If no exact matches, try probabilistic
-        if not matches or max(m['confidence_score'] for m in matches) < 0.95:
-            prob_matches = await probabilistic_matcher.match(demo_data)
-            matches.extend(prob_matches)
-            logger.info(f"Found {len(prob_matches)} probabilistic matches")
-        
-        # 3. Apply fuzzy matching for edge cases
-        fuzzy_matches = await fuzzy_matcher.match(demo_data)
-        matches.extend(fuzzy_matches)
-        
-        # 4. Use AI hybrid matching for enhanced accuracy
-        if request.use_ml:
-            ai_matches = await ai_hybrid_matcher.match(demo_data)
-            matches.extend(ai_matches)
-            
-            # Apply ML enhancement to all matches
-            if matches:
-                matches = await ml_matcher.enhance_matches(demo_data, matches)
-        
-        # Filter by threshold and deduplicate
-        matches = [m for m in matches if m['confidence_score'] >= request.match_threshold]
-        matches = deduplicate_matches(matches)
-        
-        # Sort by confidence score
-        matches.sort(key=lambda x: x['confidence_score'], reverse=True)
-        
-        # Limit to top 10 matches
-        matches = matches[:10]
-        
-        # Format response
-        formatted_matches = [
-            MatchResult(
-                identity_id=m['identity_id'],
-                confidence_score=m['confidence_score'],
-                match_type=m['match_type'],
-                matched_systems=m.get('matched_systems', []),
-                match_details=m.get('match_details', {})
+        demo_data = prepare_demographics(request.demographic_data)
+        
+        # Identical demographics + matching options resolve to the same matches; the
+        # matches are cached pre-encoded and spliced into a per-request envelope
+        cache_key = resolve_cache_key(demo_data, request.match_threshold, request.use_ml)
+        cached_matches = await cache.get_bytes(cache_key)
+        
+        if cached_matches:
+            logger.info("Cache hit for transaction %s", request.transaction_id)
+            processing_time = (time.perf_counter_ns() - start_ns) // 1_000_000
+            _spawn_background(_record_cached_resolution(cached_matches, processing_time))
+            return Response(
+                content=_encode_resolution(request.transaction_id, cached_matches, processing_time),
+                media_type="application/json"
             )
-            for m in matches
-        ]
+        
+        # Restrict pairwise matchers to identities sharing a blocking key
+        candidates = await blocking_index.collect_candidates(demo_data)
+        
+        # Coalesced with concurrent requests into one matcher pass in a worker process
+        matches = await resolve_batcher.submit(request.use_ml, (demo_data, candidates))
+        
+        # Filter by threshold, deduplicate, keep the top 10 and encode once for cache and body
+        matches, matches_payload = select_and_encode_matches(matches, request.match_threshold)
+        await cache.set_bytes(cache_key, matches_payload, expire=120)  # 2 minutes
         
         # Calculate processing time
-        processing_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
-        
-        response = IdentityResolutionResponse(
-            status="success",
-            transaction_id=request.transaction_id,
-            matches=formatted_matches,
-            processing_time_ms=processing_time,
-            timestamp=datetime.utcnow().isoformat() + "Z"
-        )
+        processing_time = (time.perf_counter_ns() - start_ns) // 1_000_000
+        payload = _encode_resolution(request.transaction_id, matches_payload, processing_time)
         
-        # Cache disabled for demo
-        # await cache.set(cache_key, response.dict(), expire=300)  # 5 minutes
+        # Record statistics without holding up the response
+        _spawn_background(cache.record_request(
+            success=bool(matches),
+            confidence=matches[0]['confidence_score'] if matches else 0.0,
+            response_ms=processing_time
+        ))
         
         # Log metrics
-        logger.info(f"Resolution completed: transaction={request.transaction_id}, "
-                   f"matches={len(formatted_matches)}, time={processing_time}ms")
+        logger.info("Resolution completed: transaction=%s, matches=%d, time=%dms",
+                    request.transaction_id, len(matches), processing_time)
         
-        return response
+        return Response(content=payload, media_type="application/json")
         
     except Exception as e:
-        logger.error(f"Error resolving identity: {str(e)}")
+        logger.exception("Error resolving identity: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Identity resolution failed: {str(e)}"
-        )
+            detail="Identity resolution failed"
+        ) from e
+
+class BatchResolveRequest(BaseModel):
+    # Items are validated one by one so a malformed identity fails alone, not the batch
+    requests: List[Dict[str, Any]] = Field(
+        ..., min_length=1, max_length=MAX_RESOLVE_BATCH,
+        description=f"Up to {MAX_RESOLVE_BATCH} identity resolution requests"
+    )
+
+@app.post("/api/v1/resolve/batch")
+async def resolve_identity_batch(batch: BatchResolveRequest):
+    """
+    Resolve up to MAX_RESOLVE_BATCH identities in one matcher pass per matching mode.
+    Results are returned in request order; items that fail validation or matching are
+    null in results and described in errors.
+    """
+    start_ns = time.perf_counter_ns()
+    
+    matches_payloads: List[Optional[bytes]] = [None] * len(batch.requests)
+    transaction_ids: List[Optional[str]] = [None] * len(batch.requests)
+    errors = []
+    pending: Dict[bool, List] = {}
+    
+    for index, item in enumerate(batch.requests):
+        try:
+            request = IdentityResolutionRequest.model_validate(item)
+        except ValidationError as e:
+            errors.append({
+                "index": index,
+                "transaction_id": item.get("transaction_id"),
+                "errors": e.errors(include_url=False, include_context=False, include_input=False)
+            })
+            continue
+        
+        transaction_ids[index] = request.transaction_id
+        demo_data = prepare_demographics(request.demographic_data)
+        cache_key = resolve_cache_key(demo_data, request.match_threshold, request.use_ml)
+        
+        cached_matches = await cache.get_bytes(cache_key)
+        if cached_matches:
+            matches_payloads[index] = cached_matches
+            _spawn_background(_record_cached_resolution(
+                cached_matches, (time.perf_counter_ns() - start_ns) // 1_000_000
+            ))
+        else:
+            pending.setdefault(request.use_ml, []).append((index, request, demo_data, cache_key))
+    
+    async def resolve_group(use_ml: bool, entries: List) -> None:
+        try:
+            candidates_batch = await asyncio.gather(
+                *(blocking_index.collect_candidates(demo_data) for _, _, demo_data, _ in entries)
+            )
+            # Bypasses the micro-batcher: the client already supplied the batch
+            raw_results = await _resolve_batch(
+                use_ml, [(demo_data, candidates) for (_, _, demo_data, _), candidates in zip(entries, candidates_batch)]
+            )
+        except Exception as e:
+            logger.exception("Error resolving identity batch: %s", e)
+            errors.extend(
+                {"index": index, "transaction_id": request.transaction_id,
+                 "errors": [{"msg": "Identity resolution failed"}]}
+                for index, request, _, _ in entries
+            )
+            return
+        
+        for (index, request, _, cache_key), raw_matches in zip(entries, raw_results):
+            matches, matches_payload = select_and_encode_matches(raw_matches, request.match_threshold)
+            await cache.set_bytes(cache_key, matches_payload, expire=120)  # 2 minutes
+            matches_payloads[index] = matches_payload
+            _spawn_background(cache.record_request(
+                success=bool(matches),
+                confidence=matches[0]['confidence_score'] if matches else 0.0,
+                response_ms=(time.perf_counter_ns() - start_ns) // 1_000_000
+            ))
+    
+    await asyncio.gather(*(resolve_group(use_ml, entries) for use_ml, entries in pending.items()))
+    
+    processing_time = (time.perf_counter_ns() - start_ns) // 1_000_000
+    results = [
+        orjson.Fragment(_encode_resolution(transaction_id, matches_payload, processing_time))
+        if matches_payload is not None else None
+        for transaction_id, matches_payload in zip(transaction_ids, matches_payloads)
+    ]
+    errors.sort(key=lambda error: error["index"])
+    
+    logger.info("Batch resolution completed: items=%d, errors=%d, time=%dms",
+                len(results), len(errors), processing_time)
+    
+    return Response(
+        content=orjson.dumps({
+            "status": "success" if not errors else "partial",
+            "results": results,
+            "errors": errors,
+            "processing_time_ms": processing_time,
+            "timestamp": utc_timestamp()
+        }),
+        media_type="application/json"
+    )
 
 # ========== COMPREHENSIVE BATCH PROCESSING ENDPOINTS ==========
 
@@ -257,37 +475,33 @@ class BatchJobRequest(BaseModel):
     config: Optional[Dict[str, Any]] = Field(None, description="Job configuration")
     priority: str = Field("normal", description="Job priority: low, normal, high, urgent")
     created_by: str = Field("api_user", description="User who created the job")
+    
+    @field_validator('job_type')
+    @classmethod
+    def check_job_type(cls, v: str) -> str:
+        if v not in _VALID_JOB_TYPES:
+            raise ValueError(f"Invalid job type: {v}")
+        return v
+    
+    @field_validator('priority')
+    @classmethod
+    def check_priority(cls, v: str) -> str:
+        if v not in _VALID_JOB_PRIORITIES:
+            raise ValueError(f"Invalid priority: {v}")
+        return v
 
 @app.post("/api/v1/batch/jobs")
 async def create_batch_job(request: BatchJobRequest):
     """Create a new batch processing job"""
     try:
-        # Validate job type
-        try:
-            job_type = JobType(request.job_type)
-        except ValueError:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid job type: {request.job_type}"
-            )
-        
-        # Validate priority
-        try:
-            priority = JobPriority(request.priority)
-        except ValueError:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid priority: {request.priority}"
-            )
-        
-        # Create job
+        # job_type and priority are validated by BatchJobRequest
         job_id = await batch_processor.create_batch_job(
             name=request.name,
-            job_type=job_type,
+            job_type=JobType(request.job_type),
             created_by=request.created_by,
             input_data=request.input_data,
             config=request.config,
-            priority=priority
+            priority=JobPriority(request.priority)
         )
         
         return {
@@ -297,11 +511,11 @@ async def create_batch_job(request: BatchJobRequest):
         }
         
     except Exception as e:
-        logger.error(f"Error creating batch job: {str(e)}")
+        logger.exception("Error creating batch job: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to create batch job: {str(e)}"
-        )
+            detail="Failed to create batch job"
+        ) from e
 
 @app.get("/api/v1/batch/jobs/{job_id}")
 async def get_batch_job_status(job_id: str):
@@ -321,11 +535,11 @@ async def get_batch_job_status(job_id: str):
         }
         
     except Exception as e:
-        logger.error(f"Error getting job status: {str(e)}")
+        logger.exception("Error getting job status: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to get job status: {str(e)}"
-        )
+            detail="Failed to get job status"
+        ) from e
 
 @app.get("/api/v1/batch/jobs")
 async def list_batch_jobs(
@@ -334,17 +548,15 @@ async def list_batch_jobs(
     offset: int = 0
 ):
     """List all batch jobs with optional filtering"""
+    # Validate status filter
+    if status_filter and status_filter not in _VALID_JOB_STATUSES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid status filter: {status_filter}"
+        )
+    
     try:
-        # Validate status filter
-        job_status_filter = None
-        if status_filter:
-            try:
-                job_status_filter = JobStatus(status_filter)
-            except ValueError:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Invalid status filter: {status_filter}"
-                )
+        job_status_filter = JobStatus(status_filter) if status_filter else None
         
         jobs = await batch_processor.get_all_jobs(
             status_filter=job_status_filter,
@@ -361,11 +573,11 @@ async def list_batch_jobs(
         }
         
     except Exception as e:
-        logger.error(f"Error listing jobs: {str(e)}")
+        logger.exception("Error listing jobs: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to list jobs: {str(e)}"
-        )
+            detail="Failed to list jobs"
+        ) from e
 
 @app.delete("/api/v1/batch/jobs/{job_id}")
 async def cancel_batch_job(job_id: str):
@@ -385,11 +597,11 @@ async def cancel_batch_job(job_id: str):
         }
         
     except Exception as e:
-        logger.error(f"Error cancelling job: {str(e)}")
+        logger.exception("Error cancelling job: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to cancel job: {str(e)}"
-        )
+            detail="Failed to cancel job"
+        ) from e
 
 @app.post("/api/v1/batch/jobs/{job_id}/pause")
 async def pause_batch_job(job_id: str):
@@ -409,11 +621,11 @@ async def pause_batch_job(job_id: str):
         }
         
     except Exception as e:
-        logger.error(f"Error pausing job: {str(e)}")
+        logger.exception("Error pausing job: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to pause job: {str(e)}"
-        )
+            detail="Failed to pause job"
+        ) from e
 
 @app.post("/api/v1/batch/jobs/{job_id}/resume")
 async def resume_batch_job(job_id: str):
@@ -433,20 +645,20 @@ async def resume_batch_job(job_id: str):
         }
         
     except Exception as e:
-        logger.error(f"Error resuming job: {str(e)}")
+        logger.exception("Error resuming job: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to resume job: {str(e)}"
-        )
+            detail="Failed to resume job"
+        ) from e
 
-@app.get("/api/v1/batch/jobs/{job_id}/results")
+@app.get("/api/v1/batch/jobs/{job_id}/results", response_model=None)
 async def get_batch_job_results(
     job_id: str,
-    page: int = 1,
-    limit: int = 1000000,
+    page: int = Query(1, ge=1),
+    limit: int = Query(1000, ge=1, le=MAX_RESULTS_PAGE_SIZE),
     status_filter: Optional[str] = None
 ):
-    """Get results for a completed batch job"""
+    """Get a page of results for a completed batch job"""
     try:
         results = await batch_processor.get_job_results(
             job_id=job_id,
@@ -455,14 +667,39 @@ async def get_batch_job_results(
             status_filter=status_filter
         )
         
-        return results
+        # Up to MAX_RESULTS_PAGE_SIZE plain records; skip jsonable_encoder's per-value walk
+        return ORJSONResponse(content=results)
         
     except Exception as e:
-        logger.error(f"Error getting job results: {str(e)}")
+        logger.exception("Error getting job results: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to get job results: {str(e)}"
+            detail="Failed to get job results"
+        ) from e
+
+@app.get("/api/v1/batch/jobs/{job_id}/results/stream")
+async def stream_batch_job_results(
+    job_id: str,
+    status_filter: Optional[str] = None
+):
+    """Stream all results for a completed batch job as NDJSON"""
+    job_status = await batch_processor.get_job_status(job_id)
+    
+    if not job_status:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job {job_id} not found"
+        )
+    if job_status['status'] != JobStatus.COMPLETED.value:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job {job_id} not completed yet"
         )
+    
+    return StreamingResponse(
+        _iter_results_ndjson(job_id, status_filter),
+        media_type="application/x-ndjson"
+    )
 
 @app.get("/api/v1/batch/jobs/{job_id}/export")
 async def export_batch_job_results(
@@ -487,11 +724,11 @@ async def export_batch_job_results(
         }
         
     except Exception as e:
-        logger.error(f"Error exporting job results: {str(e)}")
+        logger.exception("Error exporting job results: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to export job results: {str(e)}"
-        )
+            detail="Failed to export job results"
+        ) from e
 
 @app.get("/api/v1/batch/queue/statistics")
 async def get_batch_queue_statistics():
@@ -505,11 +742,11 @@ async def get_batch_queue_statistics():
         }
         
     except Exception as e:
-        logger.error(f"Error getting queue statistics: {str(e)}")
+        logger.exception("Error getting queue statistics: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to get queue statistics: {str(e)}"
-        )
+            detail="Failed to get queue statistics"
+        ) from e
 
 @app.post("/api/v1/batch/process")
 async def process_batch(file_path: str, callback_url: Optional[str] = None):
@@ -517,9 +754,11 @@ async def process_batch(file_path: str, callback_url: Optional[str] = None):
     Legacy batch processing endpoint (deprecated - use /api/v1/batch/jobs instead)
     """
     try:
+        queued_at = datetime.now(timezone.utc)
+        
         # Create job using new service
         job_id = await batch_processor.create_batch_job(
-            name=f"Legacy Batch - {datetime.utcnow().strftime('%Y-%m-%d %H:%M')}",
+            name=f"Legacy Batch - {queued_at.strftime('%Y-%m-%d %H:%M')}",
             job_type=JobType.IDENTITY_MATCHING,
             created_by="legacy_api",
             input_data=file_path,
@@ -531,15 +770,15 @@ async def process_batch(file_path: str, callback_url: Optional[str] = None):
             "status": "queued",
             "file_path": file_path,
             "callback_url": callback_url,
-            "queued_at": datetime.utcnow(),
+            "queued_at": utc_timestamp(queued_at),
             "message": "This endpoint is deprecated. Please use /api/v1/batch/jobs"
         }
     except Exception as e:
-        logger.error(f"Legacy batch processing error: {str(e)}")
+        logger.exception("Legacy batch processing error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Batch processing failed: {str(e)}"
-        )
+            detail="Batch processing failed"
+        ) from e
 
 @app.get("/api/v1/statistics")
 async def get_statistics():
@@ -547,18 +786,22 @@ async def get_statistics():
     Get matching engine statistics
     """
     try:
+        counters = await cache.get_request_stats()
+        total_requests = counters["total_requests"]
+        successful_matches = counters["successful_matches"]
+        
         stats = {
-            "total_requests": await cache.get("stats:total_requests") or 0,
-            "successful_matches": await cache.get("stats:successful_matches") or 0,
-            "average_confidence": await cache.get("stats:avg_confidence") or 0,
-            "average_response_time": await cache.get("stats:avg_response_time") or 0,
-            "cache_hit_rate": await cache.get("stats:cache_hit_rate") or 0,
-            "timestamp": datetime.utcnow().isoformat() + "Z"
+            "total_requests": total_requests,
+            "successful_matches": successful_matches,
+            "average_confidence": counters["confidence_sum"] / successful_matches if successful_matches else 0,
+            "average_response_time": counters["response_ms_sum"] / total_requests if total_requests else 0,
+            "cache_hit_rate": counters["cache_hit_rate"],
+            "timestamp": utc_timestamp()
         }
         return stats
     except Exception as e:
-        logger.error(f"Error fetching statistics: {str(e)}")
-        return {"error": str(e)}
+        logger.exception("Error fetching statistics: %s", e)
+        return {"error": "Failed to fetch statistics"}
 
 # ========== DATA SOURCE MANAGEMENT ENDPOINTS ==========
 
@@ -568,12 +811,26 @@ class DataSourceValidationRequest(BaseModel):
     format: Optional[str] = Field(None, description="Data format")
     connection_string: Optional[str] = Field(None, description="Connection string")
     credentials: Optional[Dict[str, str]] = Field(None, description="Credentials")
+    
+    @field_validator('source_type')
+    @classmethod
+    def check_source_type(cls, v: str) -> str:
+        if v not in _VALID_SOURCE_TYPES:
+            raise ValueError(f"Invalid data source type: {v}")
+        return v
+    
+    @field_validator('format')
+    @classmethod
+    def check_format(cls, v: Optional[str]) -> Optional[str]:
+        if v and v not in _VALID_FILE_FORMATS:
+            raise ValueError(f"Invalid data format: {v}")
+        return v
 
 @app.post("/api/v1/data-sources/validate")
 async def validate_data_source(request: DataSourceValidationRequest):
     """Validate a data source configuration"""
     try:
-        # Convert string to enum
+        # Values are validated by DataSourceValidationRequest
         source_type = DataSourceType(request.source_type)
         format_type = FileFormat(request.format) if request.format else None
         
@@ -585,7 +842,7 @@ async def validate_data_source(request: DataSourceValidationRequest):
             credentials=request.credentials
         )
         
-        validation_result = await data_source_service.validate_data_source(data_source_config)
+        validation_result = await run_off_loop(data_source_service.validate_data_source, data_source_config)
         
         return {
             "status": "success",
@@ -598,11 +855,11 @@ async def validate_data_source(request: DataSourceValidationRequest):
             detail=f"Invalid data source configuration: {str(e)}"
         )
     except Exception as e:
-        logger.error(f"Data source validation error: {str(e)}")
+        logger.exception("Data source validation error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Data source validation failed: {str(e)}"
-        )
+            detail="Data source validation failed"
+        ) from e
 
 @app.post("/api/v1/data-sources/preview")
 async def preview_data_source(request: DataSourceValidationRequest):
@@ -619,7 +876,7 @@ async def preview_data_source(request: DataSourceValidationRequest):
             credentials=request.credentials
         )
         
-        data_source_info = await data_source_service.get_data_source_info(data_source_config)
+        data_source_info = await run_off_loop(data_source_service.get_data_source_info, data_source_config)
         
         return {
             "status": "success",
@@ -627,11 +884,11 @@ async def preview_data_source(request: DataSourceValidationRequest):
         }
         
     except Exception as e:
-        logger.error(f"Data source preview error: {str(e)}")
+        logger.exception("Data source preview error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Data source preview failed: {str(e)}"
-        )
+            detail="Data source preview failed"
+        ) from e
 
 @app.get("/api/v1/data-sources/types")
 async def get_data_source_types():
@@ -652,11 +909,11 @@ async def get_data_source_types():
         }
         
     except Exception as e:
-        logger.error(f"Error getting data source types: {str(e)}")
+        logger.exception("Error getting data source types: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to get data source types: {str(e)}"
-        )
+            detail="Failed to get data source types"
+        ) from e
 
 @app.get("/api/v1/data-sources/formats")
 async def get_supported_formats():
@@ -676,11 +933,11 @@ async def get_supported_formats():
         }
         
     except Exception as e:
-        logger.error(f"Error getting formats: {str(e)}")
+        logger.exception("Error getting formats: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to get formats: {str(e)}"
-        )
+            detail="Failed to get formats"
+        ) from e
 
 # ========== OUTPUT FORMAT MANAGEMENT ENDPOINTS ==========
 
@@ -690,6 +947,13 @@ class OutputFormatValidationRequest(BaseModel):
     config: Dict[str, Any] = Field(..., description="Output configuration")
     filename_template: Optional[str] = Field(None, description="Filename template")
     compression: Optional[str] = Field(None, description="Compression format")
+    
+    @field_validator('format')
+    @classmethod
+    def check_format(cls, v: str) -> str:
+        if v not in _VALID_OUTPUT_FORMATS:
+            raise ValueError(f"Invalid output format: {v}")
+        return v
 
 @app.post("/api/v1/output-formats/validate")
 async def validate_output_format(request: OutputFormatValidationRequest):
@@ -705,7 +969,7 @@ async def validate_output_format(request: OutputFormatValidationRequest):
             compression=request.compression
         )
         
-        validation_result = await output_format_service.validate_output_config(output_config)
+        validation_result = await run_off_loop(output_format_service.validate_output_config, output_config)
         
         return {
             "status": "success",
@@ -718,11 +982,11 @@ async def validate_output_format(request: OutputFormatValidationRequest):
             detail=f"Invalid output format configuration: {str(e)}"
         )
     except Exception as e:
-        logger.error(f"Output format validation error: {str(e)}")
+        logger.exception("Output format validation error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Output format validation failed: {str(e)}"
-        )
+            detail="Output format validation failed"
+        ) from e
 
 @app.get("/api/v1/output-formats/types")
 async def get_output_format_types():
@@ -742,11 +1006,11 @@ async def get_output_format_types():
         }
         
     except Exception as e:
-        logger.error(f"Error getting output formats: {str(e)}")
+        logger.exception("Error getting output formats: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to get output formats: {str(e)}"
-        )
+            detail="Failed to get output formats"
+        ) from e
 
 # ========== ADMIN AND MANAGEMENT ENDPOINTS ==========
 
@@ -754,46 +1018,56 @@ async def get_output_format_types():
 async def get_admin_dashboard():
     """Get comprehensive admin dashboard data"""
     try:
-        dashboard_data = await admin_service.get_dashboard_data()
-        return dashboard_data
+        return await response_cache.respond(
+            "admin:dashboard", ADMIN_DASHBOARD_POLICY, admin_service.get_dashboard_data
+        )
     except Exception as e:
-        logger.error(f"Dashboard error: {str(e)}")
+        logger.exception("Dashboard error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Dashboard data retrieval failed: {str(e)}"
-        )
+            detail="Dashboard data retrieval failed"
+        ) from e
 
 @app.get("/api/v1/admin/system/diagnostics")
 async def get_system_diagnostics():
     """Run comprehensive system diagnostics"""
     try:
-        diagnostics = admin_service.get_system_diagnostics()
-        return diagnostics
+        return await response_cache.respond(
+            "admin:diagnostics",
+            ADMIN_DIAGNOSTICS_POLICY,
+            lambda: asyncio.to_thread(admin_service.get_system_diagnostics)
+        )
     except Exception as e:
-        logger.error(f"Diagnostics error: {str(e)}")
+        logger.exception("Diagnostics error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"System diagnostics failed: {str(e)}"
-        )
+            detail="System diagnostics failed"
+        ) from e
 
 @app.get("/api/v1/admin/users")
 async def list_users(include_inactive: bool = False):
     """List all users in the system"""
     try:
-        users = admin_service.user_manager.list_users(include_inactive=include_inactive)
-        return {"users": users, "count": len(users)}
+        def list_user_payload():
+            users = admin_service.user_manager.list_users(include_inactive=include_inactive)
+            return {"users": users, "count": len(users)}
+        
+        return await response_cache.respond(
+            f"{ADMIN_USERS_CACHE_PREFIX}{include_inactive}", ADMIN_USERS_POLICY, list_user_payload
+        )
     except Exception as e:
-        logger.error(f"User listing error: {str(e)}")
+        logger.exception("User listing error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"User listing failed: {str(e)}"
-        )
+            detail="User listing failed"
+        ) from e
 
 @app.post("/api/v1/admin/users")
 async def create_user(username: str, email: str, role: str, created_by: str = "admin"):
     """Create a new user account"""
     try:
         user = admin_service.user_manager.create_user(username, email, role, created_by)
+        await cache.delete_prefix(ADMIN_USERS_CACHE_PREFIX)
         return {"status": "created", "user": user}
     except ValueError as e:
         raise HTTPException(
@@ -801,11 +1075,11 @@ async def create_user(username: str, email: str, role: str, created_by: str = "a
             detail=str(e)
         )
     except Exception as e:
-        logger.error(f"User creation error: {str(e)}")
+        logger.exception("User creation error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"User creation failed: {str(e)}"
-        )
+            detail="User creation failed"
+        ) from e
 
 # ========== SECURITY AND COMPLIANCE ENDPOINTS ==========
 
@@ -816,11 +1090,11 @@ async def get_compliance_status(framework: str):
         assessment = compliance_service.assess_compliance(framework)
         return assessment
     except Exception as e:
-        logger.error(f"Compliance assessment error: {str(e)}")
+        logger.exception("Compliance assessment error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Compliance assessment failed: {str(e)}"
-        )
+            detail="Compliance assessment failed"
+        ) from e
 
 @app.get("/api/v1/security/compliance/report")
 async def get_compliance_report():
@@ -829,77 +1103,137 @@ async def get_compliance_report():
         report = compliance_service.generate_compliance_report()
         return report
     except Exception as e:
-        logger.error(f"Compliance report error: {str(e)}")
+        logger.exception("Compliance report error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Compliance report generation failed: {str(e)}"
-        )
+            detail="Compliance report generation failed"
+        ) from e
 
 @app.get("/api/v1/security/audit/logs")
-async def get_audit_logs(start_date: str, end_date: str):
-    """Get security audit logs for date range"""
+async def get_audit_logs(
+    request: Request,
+    response: Response,
+    start_date: Union[datetime, date],
+    end_date: Union[datetime, date],
+    limit: int = Query(500, ge=1, le=MAX_AUDIT_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page")
+):
+    """Get security audit logs for date range, newest first, one page at a time"""
     try:
-        start = datetime.fromisoformat(start_date)
-        end = datetime.fromisoformat(end_date)
-        logs = security_service.generate_audit_log(start, end)
-        return {"logs": logs, "count": len(logs)}
+        logs, next_cursor, total = security_service.query_audit_log(
+            as_datetime(start_date), as_datetime(end_date), limit, cursor
+        )
+        response.headers["X-Total-Estimated"] = str(total)
+        if next_cursor:
+            response.headers["Link"] = f'<{request.url.include_query_params(cursor=next_cursor)}>; rel="next"'
+        return {"logs": logs, "count": len(logs), "next_cursor": next_cursor}
     except ValueError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid date format. Use ISO format (YYYY-MM-DD)"
+            detail="Invalid cursor"
         )
     except Exception as e:
-        logger.error(f"Audit log error: {str(e)}")
+        logger.exception("Audit log error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Audit log retrieval failed: {str(e)}"
-        )
+            detail="Audit log retrieval failed"
+        ) from e
 
 # ========== DATA QUALITY ENDPOINTS ==========
 
+class AddressRecord(BaseModel):
+    model_config = ConfigDict(extra='allow')
+    
+    street: Optional[str] = Field(None, description="Street address")
+    city: Optional[str] = Field(None, description="City")
+    state: Optional[str] = Field(None, description="State code")
+    zip: Optional[Any] = Field(None, description="ZIP code")
+
+class IdentityRecord(BaseModel):
+    # Raw, unnormalized input: data quality validation exists to report malformed values,
+    # so dob/ssn/phone/zip accept anything and are judged by the services, not by a 422.
+    # Source-specific extras pass through as well.
+    model_config = ConfigDict(extra='allow')
+    
+    identity_id: Optional[str] = Field(None, description="Identity identifier")
+    first_name: Optional[str] = Field(None, description="First name")
+    middle_name: Optional[str] = Field(None, description="Middle name")
+    last_name: Optional[str] = Field(None, description="Last name")
+    dob: Optional[Any] = Field(None, description="Date of birth")
+    gender: Optional[str] = Field(None, description="Gender")
+    ssn: Optional[Any] = Field(None, description="Social Security Number")
+    phone: Optional[Any] = Field(None, description="Phone number")
+    email: Optional[str] = Field(None, description="Email address")
+    address: Optional[AddressRecord] = Field(None, description="Address information")
+    
+    def to_service_dict(self) -> Dict[str, Any]:
+        """Plain dict for the dict-based services; unset fields are left out so .get() defaults apply"""
+        return self.model_dump(mode='json', exclude_none=True)
+
+class RealtimeProcessingRequest(BaseModel):
+    model_config = ConfigDict(extra='allow')
+    
+    demographic_data: IdentityRecord
+    source_system: str = Field(..., description="Source system identifier")
+    request_id: Optional[str] = Field(None, description="Client request identifier")
+    timeout_seconds: int = Field(30, gt=0, description="Processing timeout")
+    callback_url: Optional[str] = Field(None, description="Callback URL for the result")
+    require_high_confidence: bool = Field(False, description="Only return high-confidence matches")
+    max_results: int = Field(10, gt=0, description="Maximum number of matches")
+
 @app.post("/api/v1/data-quality/validate")
-async def validate_data_quality(data: Dict[str, Any]):
+async def validate_data_quality(data: IdentityRecord):
     """Validate data quality for identity records"""
     try:
-        validation_result = await data_quality_service.validate_identity_data(data)
+        validation_result = await data_quality_service.validate_identity_data(data.to_service_dict())
+        await response_cache.invalidate_tag(REPORTS_TAG)
         return validation_result
     except Exception as e:
-        logger.error(f"Data validation error: {str(e)}")
+        logger.exception("Data validation error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Data validation failed: {str(e)}"
-        )
+            detail="Data validation failed"
+        ) from e
 
-@app.get("/api/v1/data-quality/report")
-async def get_data_quality_report():
+@app.get("/api/v1/data-quality/report", response_model=None)
+async def get_data_quality_report(days: int = 30):
     """Get comprehensive data quality report"""
     try:
-        report = await data_quality_service.generate_quality_report()
-        return report
+        return await response_cache.respond(
+            f"{REPORT_CACHE_PREFIX}data-quality:{days}",
+            REPORT_POLICY,
+            lambda: reporting_service.generate_data_quality_report(days),
+            tags=(REPORTS_TAG,)
+        )
     except Exception as e:
-        logger.error(f"Data quality report error: {str(e)}")
+        logger.exception("Data quality report error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Data quality report generation failed: {str(e)}"
-        )
+            detail="Data quality report generation failed"
+        ) from e
 
 # ========== HOUSEHOLD DETECTION ENDPOINTS ==========
 
-@app.post("/api/v1/households/detect")
-async def detect_households(identities: List[Dict[str, Any]]):
+@app.post("/api/v1/households/detect", response_model=None)
+async def detect_households(identities: List[IdentityRecord]):
     """Detect household relationships among identities"""
     try:
-        households = await household_detector.detect_households(identities)
-        return {
-            "households": [household.__dict__ for household in households],
+        households = await run_off_loop(
+            household_detector.detect_households,
+            [identity.to_service_dict() for identity in identities]
+        )
+        await response_cache.invalidate_tag(REPORTS_TAG)
+        # orjson serializes the slotted dataclasses, enums and datetimes natively
+        return ORJSONResponse(content={
+            "households": households,
             "count": len(households)
-        }
+        })
     except Exception as e:
-        logger.error(f"Household detection error: {str(e)}")
+        logger.exception("Household detection error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Household detection failed: {str(e)}"
-        )
+            detail="Household detection failed"
+        ) from e
 
 @app.get("/api/v1/households/{household_id}/relationships")
 async def get_household_relationships(household_id: str):
@@ -908,100 +1242,135 @@ async def get_household_relationships(household_id: str):
         relationships = await household_detector.analyze_relationships(household_id)
         return relationships
     except Exception as e:
-        logger.error(f"Relationship analysis error: {str(e)}")
+        logger.exception("Relationship analysis error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Relationship analysis failed: {str(e)}"
-        )
+            detail="Relationship analysis failed"
+        ) from e
 
 # ========== REPORTING ENDPOINTS ==========
 
-@app.get("/api/v1/reports/performance")
+@app.get("/api/v1/reports/performance", response_model=None)
 async def get_performance_report(days: int = 30):
     """Get system performance report"""
     try:
-        report = await reporting_service.generate_performance_report(days)
-        return report
+        return await response_cache.respond(
+            f"{REPORT_CACHE_PREFIX}performance:{days}",
+            REPORT_POLICY,
+            lambda: reporting_service.generate_performance_report(days),
+            tags=(REPORTS_TAG,)
+        )
     except Exception as e:
-        logger.error(f"Performance report error: {str(e)}")
+        logger.exception("Performance report error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Performance report generation failed: {str(e)}"
-        )
+            detail="Performance report generation failed"
+        ) from e
 
-@app.get("/api/v1/reports/matching")
-async def get_matching_report(start_date: str, end_date: str):
+@app.get("/api/v1/reports/matching", response_model=None)
+async def get_matching_report(start_date: Union[datetime, date], end_date: Union[datetime, date]):
     """Get matching effectiveness report"""
+    start = as_datetime(start_date)
+    end = as_datetime(end_date)
+    
     try:
-        start = datetime.fromisoformat(start_date)
-        end = datetime.fromisoformat(end_date)
-        report = await reporting_service.generate_matching_report(start, end)
-        return report
-    except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid date format. Use ISO format (YYYY-MM-DD)"
+        # Keyed on the parsed range so equivalent date spellings share an entry
+        return await response_cache.respond(
+            f"{REPORT_CACHE_PREFIX}matching:{start.isoformat()}:{end.isoformat()}",
+            MATCHING_REPORT_POLICY,
+            lambda: reporting_service.generate_matching_report(start, end),
+            tags=(REPORTS_TAG,)
         )
     except Exception as e:
-        logger.error(f"Matching report error: {str(e)}")
+        logger.exception("Matching report error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Matching report generation failed: {str(e)}"
-        )
+            detail="Matching report generation failed"
+        ) from e
 
-@app.get("/api/v1/reports/executive")
+@app.get("/api/v1/reports/executive", response_model=None)
 async def get_executive_report():
     """Get executive dashboard report"""
     try:
-        report = await reporting_service.generate_executive_report()
-        return report
+        return await response_cache.respond(
+            f"{REPORT_CACHE_PREFIX}executive",
+            REPORT_POLICY,
+            reporting_service.generate_executive_report,
+            tags=(REPORTS_TAG,)
+        )
     except Exception as e:
-        logger.error(f"Executive report error: {str(e)}")
+        logger.exception("Executive report error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Executive report generation failed: {str(e)}"
-        )
+            detail="Executive report generation failed"
+        ) from e
 
 # ========== REAL-TIME PROCESSING ENDPOINTS ==========
 
 @app.post("/api/v1/realtime/process")
-async def submit_realtime_request(request_data: Dict[str, Any], priority: str = "normal"):
+async def submit_realtime_request(
+    request_data: RealtimeProcessingRequest,
+    priority: Literal["critical", "high", "normal", "low"] = "normal"
+):
     """Submit request for real-time processing"""
     try:
-        result = await realtime_processor.process_request(request_data, priority)
-        return result
+        # Unknown priority names are rejected with a 422; the processor queues by integer priority
+        processing_request = ProcessingRequest(
+            request_id=request_data.request_id or str(uuid.uuid4()),
+            demographic_data=request_data.demographic_data.to_service_dict(),
+            source_system=request_data.source_system,
+            priority=ProcessingPriority[priority.upper()],
+            submitted_at=datetime.now(),
+            timeout_seconds=request_data.timeout_seconds,
+            callback_url=request_data.callback_url,
+            require_high_confidence=request_data.require_high_confidence,
+            max_results=request_data.max_results
+        )
+        return await realtime_processor.process_identity_resolution(processing_request)
     except Exception as e:
-        logger.error(f"Real-time processing error: {str(e)}")
+        logger.exception("Real-time processing error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Real-time processing failed: {str(e)}"
-        )
+            detail="Real-time processing failed"
+        ) from e
 
 @app.get("/api/v1/realtime/status")
 async def get_realtime_status():
     """Get real-time processing system status"""
     try:
-        status_info = await realtime_processor.get_system_status()
-        return status_info
+        return await response_cache.respond(
+            "realtime:status", SHORT, realtime_processor.get_system_status
+        )
     except Exception as e:
-        logger.error(f"Real-time status error: {str(e)}")
+        logger.exception("Real-time status error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Real-time status retrieval failed: {str(e)}"
-        )
+            detail="Real-time status retrieval failed"
+        ) from e
+
+def _realtime_queue_status() -> Dict[str, Any]:
+    """Queue-related subset of the real-time processor status"""
+    system_status = realtime_processor.get_system_status()
+    return {
+        'timestamp': system_status['timestamp'],
+        'queue_size': system_status['queue_size'],
+        'active_requests': system_status['active_requests'],
+        'worker_stats': system_status['worker_stats']
+    }
 
 @app.get("/api/v1/realtime/queue")
 async def get_queue_status():
     """Get processing queue status"""
     try:
-        queue_status = realtime_processor.get_queue_status()
-        return queue_status
+        return await response_cache.respond(
+            "realtime:queue", SHORT, _realtime_queue_status
+        )
     except Exception as e:
-        logger.error(f"Queue status error: {str(e)}")
+        logger.exception("Queue status error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Queue status retrieval failed: {str(e)}"
-        )
+            detail="Queue status retrieval failed"
+        ) from e
 
 # ========== DATA TRANSFORMATION ENDPOINTS ==========
 
@@ -1020,6 +1389,7 @@ async def create_data_mapping(request: DataMappingRequest):
     """Create a new data mapping configuration"""
     try:
         mapping_config = await data_transformation_service.create_mapping_config(request.mapping_data)
+        await response_cache.invalidate_tag(REPORTS_TAG)
         
         return {
             "status": "success",
@@ -1032,11 +1402,11 @@ async def create_data_mapping(request: DataMappingRequest):
         }
         
     except Exception as e:
-        logger.error(f"Create mapping error: {str(e)}")
+        logger.exception("Create mapping error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to create mapping configuration: {str(e)}"
-        )
+            detail="Failed to create mapping configuration"
+        ) from e
 
 @app.post("/api/v1/transformations/validate-mapping")
 async def validate_data_mapping(request: DataMappingRequest):
@@ -1051,20 +1421,24 @@ async def validate_data_mapping(request: DataMappingRequest):
         }
         
     except Exception as e:
-        logger.error(f"Validate mapping error: {str(e)}")
+        logger.exception("Validate mapping error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to validate mapping configuration: {str(e)}"
-        )
+            detail="Failed to validate mapping configuration"
+        ) from e
 
-@app.post("/api/v1/transformations/apply")
+@app.post("/api/v1/transformations/apply", response_model=None)
 async def apply_data_transformations(request: DataTransformationRequest):
     """Apply data transformations to a dataset"""
     try:
         mapping_config = await data_transformation_service.create_mapping_config(request.mapping_config)
-        transformed_data = await data_transformation_service.apply_transformations(request.data, mapping_config)
+        transformed_data = await run_off_loop(
+            data_transformation_service.apply_transformations, request.data, mapping_config
+        )
+        await response_cache.invalidate_tag(REPORTS_TAG)
         
-        return {
+        # transformed_data can be large; encode it directly rather than through jsonable_encoder
+        return ORJSONResponse(content={
             "status": "success",
             "transformed_data": transformed_data,
             "record_count": len(transformed_data),
@@ -1074,14 +1448,36 @@ async def apply_data_transformations(request: DataTransformationRequest):
                 "applied_mappings": len(mapping_config.field_mappings),
                 "applied_transformations": len(mapping_config.global_transformations)
             }
-        }
+        })
         
     except Exception as e:
-        logger.error(f"Apply transformations error: {str(e)}")
+        logger.exception("Apply transformations error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to apply transformations: {str(e)}"
+            detail="Failed to apply transformations"
+        ) from e
+
+@app.post("/api/v1/transformations/apply/stream")
+async def stream_data_transformations(request: DataTransformationRequest):
+    """Apply data transformations and stream the transformed records as NDJSON"""
+    try:
+        mapping_config = await data_transformation_service.create_mapping_config(request.mapping_config)
+        transformed_data = await run_off_loop(
+            data_transformation_service.apply_transformations, request.data, mapping_config
         )
+        await response_cache.invalidate_tag(REPORTS_TAG)
+    except Exception as e:
+        logger.exception("Apply transformations error: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to apply transformations"
+        ) from e
+    
+    return StreamingResponse(
+        _iter_ndjson(transformed_data),
+        media_type="application/x-ndjson",
+        headers={"X-Record-Count": str(len(transformed_data))}
+    )
 
 @app.post("/api/v1/transformations/suggest-fields")
 async def suggest_field_mappings(request: FieldSuggestionRequest):
@@ -1095,80 +1491,255 @@ async def suggest_field_mappings(request: FieldSuggestionRequest):
         }
         
     except Exception as e:
-        logger.error(f"Field suggestions error: {str(e)}")
+        logger.exception("Field suggestions error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to generate field suggestions: {str(e)}"
-        )
+            detail="Failed to generate field suggestions"
+        ) from e
+
+# Both enums are fixed at import, so their listings are encoded once
+_FIELD_TYPES_BODY = orjson.dumps({
+    "status": "success",
+    "field_types": [
+        {
+            "value": field_type.value,
+            "name": field_type.name.replace("_", " ").title(),
+            "description": f"Standard {field_type.value.replace('_', ' ')} field"
+        }
+        for field_type in FieldType
+    ]
+})
+
+_TRANSFORMATION_TYPES_BODY = orjson.dumps({
+    "status": "success",
+    "transformation_types": [
+        {
+            "value": trans_type.value,
+            "name": trans_type.name.replace("_", " ").title(),
+            "description": f"{trans_type.value.replace('_', ' ').title()} transformation"
+        }
+        for trans_type in TransformationType
+    ]
+})
 
 @app.get("/api/v1/transformations/field-types")
 async def get_available_field_types():
     """Get available field types for mapping"""
-    try:
-        field_types = [
-            {
-                "value": field_type.value,
-                "name": field_type.name.replace("_", " ").title(),
-                "description": f"Standard {field_type.value.replace('_', ' ')} field"
-            }
-            for field_type in FieldType
-        ]
-        
-        return {
-            "status": "success",
-            "field_types": field_types
-        }
-        
-    except Exception as e:
-        logger.error(f"Get field types error: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to get field types: {str(e)}"
-        )
+    return Response(content=_FIELD_TYPES_BODY, media_type="application/json")
 
 @app.get("/api/v1/transformations/transformation-types")
 async def get_available_transformation_types():
     """Get available transformation types"""
-    try:
-        transformation_types = [
+    return Response(content=_TRANSFORMATION_TYPES_BODY, media_type="application/json")
+
+async def _iter_results_ndjson(job_id: str, status_filter: Optional[str]):
+    """
+    Encode batch results one line at a time so memory stays bounded by the read chunk
+    """
+    async for row in batch_processor.iter_job_results(job_id, status_filter=status_filter, chunk_size=1000):
+        yield orjson.dumps(row, option=ORJSON_OPTIONS) + b"\n"
+
+async def _iter_ndjson(rows: List[Dict[str, Any]], chunk_size: int = 1000):
+    """
+    Encode rows as NDJSON a chunk at a time, so the full serialized body never sits in
+    memory alongside the rows
+    """
+    for start in range(0, len(rows), chunk_size):
+        yield b"".join(
+            orjson.dumps(row, option=ORJSON_OPTIONS) + b"\n" for row in rows[start:start + chunk_size]
+        )
+
+def resolve_cache_key(demo_data: Dict, match_threshold: float, use_ml: bool) -> str:
+    """
+    Deterministic resolve cache key: blake2b over the canonical demographics plus options.
+    Names are case-folded since every matcher compares them case-insensitively; other
+    fields stay verbatim because deterministic matching compares them exactly.
+    """
+    canonical = {
+        k: v.lower() if k in _CASE_FOLDED_FIELDS else v
+        for k, v in demo_data.items()
+    }
+    digest = hashlib.blake2b(
+        orjson.dumps(canonical, option=orjson.OPT_SORT_KEYS) + f"|{match_threshold}|{use_ml}".encode(),
+        digest_size=16
+    ).hexdigest()
+    return f"{RESOLVE_CACHE_PREFIX}{digest}"
+
+def utc_timestamp(moment: Optional[datetime] = None) -> str:
+    """ISO-8601 UTC timestamp with millisecond precision, e.g. 2024-01-01T12:00:00.000Z"""
+    moment = moment or datetime.now(timezone.utc)
+    return moment.strftime('%Y-%m-%dT%H:%M:%S.') + f"{moment.microsecond // 1000:03d}Z"
+
+def as_datetime(value: Union[datetime, date]) -> datetime:
+    """
+    Date range query parameters are parsed by pydantic as a datetime or a plain date;
+    plain dates mean midnight, as datetime.fromisoformat reads them
+    """
+    if isinstance(value, datetime):
+        return value
+    return datetime.combine(value, dt_time.min)
+
+def prepare_demographics(demographic_data: DemographicData) -> Dict[str, Any]:
+    """Drop unset fields and apply per-field normalization once per query"""
+    demo_data = demographic_data.model_dump(exclude_none=True)
+    return {k: _NORMALIZE[k](v) if k in _NORMALIZE else v for k, v in demo_data.items()}
+
+def select_and_encode_matches(matches: List[Dict], threshold: float):
+    """
+    Keep the top 10 deduplicated matches at or above threshold and encode them.
+    Matchers already produce dicts of the right shape, so they are encoded as-is.
+    """
+    matches = top_matches(matches, k=10, threshold=threshold)
+    matches_payload = orjson.dumps(
+        [
             {
-                "value": trans_type.value,
-                "name": trans_type.name.replace("_", " ").title(),
-                "description": f"{trans_type.value.replace('_', ' ').title()} transformation"
+                "identity_id": m['identity_id'],
+                "confidence_score": m['confidence_score'],
+                "match_type": m['match_type'],
+                "matched_systems": m.get('matched_systems', []),
+                "match_details": m.get('match_details', {})
             }
-            for trans_type in TransformationType
-        ]
-        
-        return {
-            "status": "success",
-            "transformation_types": transformation_types
-        }
-        
-    except Exception as e:
-        logger.error(f"Get transformation types error: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to get transformation types: {str(e)}"
+            for m in matches
+        ],
+        option=ORJSON_OPTIONS
+    )
+    return matches, matches_payload
+
+def _encode_resolution(transaction_id: str, matches_payload: bytes, processing_time_ms: int) -> bytes:
+    """Wrap pre-encoded matches in the per-request response envelope"""
+    return orjson.dumps({
+        "status": "success",
+        "transaction_id": transaction_id,
+        "matches": orjson.Fragment(matches_payload),
+        "processing_time_ms": processing_time_ms,
+        "timestamp": utc_timestamp()
+    })
+
+async def run_off_loop(service_call, *args):
+    """
+    Run an async service method on a worker thread with its own event loop. For
+    services declared async whose bodies block (psycopg2, requests, pandas file
+    reads, long CPU loops), so they don't stall the server's event loop.
+    """
+    return await asyncio.to_thread(asyncio.run, service_call(*args))
+
+def _spawn_background(coro) -> None:
+    """Fire-and-forget a coroutine, holding a reference until it finishes"""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+async def _record_cached_resolution(matches_payload: bytes, response_ms: int) -> None:
+    """Record statistics for a resolve served from the cache, decoding its matches off the response path"""
+    matches = orjson.loads(matches_payload)
+    await cache.record_request(
+        success=bool(matches),
+        confidence=matches[0]['confidence_score'] if matches else 0.0,
+        response_ms=response_ms,
+        cache_hit=True
+    )
+
+def deduplicate_matches(
+    matches: List[Dict],
+    key: Optional[Callable[[Dict], Hashable]] = None,
+    already_unique: bool = False,
+    sorted_by_id: bool = False
+) -> List[Dict]:
+    """
+    Remove duplicate matches based on identity_id (or key(match) for composite keys),
+    keeping the first occurrence in its original position. Inputs that are already
+    unique, or have fewer than two matches, are returned as-is rather than copied;
+    sorted_by_id says duplicates are adjacent, so no lookup table is needed.
+    """
+    if already_unique or len(matches) < 2:
+        return matches
+    
+    match_key = key or operator.itemgetter('identity_id')
+    if sorted_by_id:
+        return [next(group) for _, group in itertools.groupby(matches, key=match_key)]
+    
+    unique_matches = {}
+    for match in matches:
+        unique_matches.setdefault(match_key(match), match)
+    
+    return list(unique_matches.values())
+
+def top_matches(matches: List[Dict], k: int = 10, threshold: float = 0.0) -> List[Dict]:
+    """
+    Drop matches below threshold, deduplicate and return the k highest-confidence
+    ones, best first
+    """
+    if len(matches) <= TOPK_NUMPY_MIN_MATCHES:
+        unique_matches = deduplicate_matches(
+            [m for m in matches if m['confidence_score'] >= threshold]
         )
+        unique_matches.sort(key=lambda x: x['confidence_score'], reverse=True)
+        return unique_matches[:k]
+    
+    return _topk_numpy(matches, k, threshold)
 
-def deduplicate_matches(matches: List[Dict]) -> List[Dict]:
+def _topk_numpy(matches: List[Dict], k: int, threshold: float) -> List[Dict]:
     """
-    Remove duplicate matches based on identity_id
+    NumPy variant of top_matches for large fan-outs. Ids and scores are unpacked
+    once into parallel arrays; the threshold is a mask, np.unique keeps the first
+    passing occurrence of each identity_id and np.partition finds the k-th best score
+    in O(n). Partitioning only picks that score: argpartition would choose arbitrarily
+    among matches tied with it, so every tie is kept and a stable argsort ranks them
+    in original order, exactly like the Python path.
     """
-    seen = set()
-    unique_matches = []
+    n = len(matches)
+    scores = np.fromiter((m['confidence_score'] for m in matches), dtype=np.float64, count=n)
+    passing = np.flatnonzero(scores >= threshold)
+    if not len(passing):
+        return []
     
-    for match in matches:
-        if match['identity_id'] not in seen:
-            seen.add(match['identity_id'])
-            unique_matches.append(match)
+    ids = np.array([matches[i]['identity_id'] for i in passing])
+    _, first_index = np.unique(ids, return_index=True)
+    first_index = passing[np.sort(first_index)]  # original order so ties resolve like the stable Python sort
+    unique_scores = scores[first_index]
+    
+    if len(unique_scores) > k:
+        # Everything tied with the k-th best score stays in so the stable sort picks among ties
+        kth_score = -np.partition(-unique_scores, k - 1)[k - 1]
+        candidates = np.flatnonzero(unique_scores >= kth_score)
+    else:
+        candidates = np.arange(len(unique_scores))
     
-    return unique_matches
+    ranked = candidates[np.argsort(-unique_scores[candidates], kind='stable')][:k]
+    return [matches[first_index[i]] for i in ranked]
+
+def web_worker_count() -> int:
+    """
+    Number of uvicorn worker processes the __main__ launcher spawns (defaults to one
+    per core). UVICORN_WORKERS wins over the operator-facing WORKERS / WEB_CONCURRENCY
+    settings.
+    """
+    for name in ("UVICORN_WORKERS", "WORKERS", "WEB_CONCURRENCY"):
+        if os.getenv(name):
+            return int(os.environ[name])
+    return os.cpu_count() or 1
+
+def serving_worker_count() -> int:
+    """
+    Number of web workers sharing this host's cores, as exported to the running worker:
+    UVICORN_WORKERS by the __main__ launcher, WEB_CONCURRENCY by uvicorn/gunicorn
+    deployments. Unset means a single worker, e.g. a plain `uvicorn main:app`, which
+    then gets every core for matching.
+    """
+    return int(os.getenv("UVICORN_WORKERS") or os.getenv("WEB_CONCURRENCY") or 1)
 
 if __name__ == "__main__":
+    reload = os.getenv("ENV", "development") == "development"
+    # uvicorn ignores workers when reloading, so only fan out outside development
+    workers = 1 if reload else web_worker_count()
+    # Worker processes inherit this and size their matcher pools from it
+    os.environ["UVICORN_WORKERS"] = str(workers)
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=int(os.getenv("PORT", 8000)),
-        reload=os.getenv("ENV", "development") == "development"
+        loop="uvloop",
+        http="httptools",
+        reload=reload,
+        workers=workers
     )
\ No newline at end of file
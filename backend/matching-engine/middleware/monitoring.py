@@ -10,20 +10,23 @@ import logging
 import os
 import traceback
 import psutil
+import numpy as np
+import queue
 import threading
-from typing import Dict, List, Optional, Any, Callable
-from dataclasses import dataclass, asdict
-from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Any, Callable, Tuple
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from enum import Enum
-from collections import defaultdict, deque
-import uuid
+from collections import OrderedDict, defaultdict, deque
 
 from fastapi import Request, Response
-from fastapi.middleware.base import BaseHTTPMiddleware
+from starlette.middleware.base import BaseHTTPMiddleware
 from fastapi.responses import JSONResponse
 import prometheus_client
 from prometheus_client import Counter, Histogram, Gauge, Info
 
+logger = logging.getLogger(__name__)
+
 # Prometheus metrics
 REQUEST_COUNT = Counter(
     'idxr_http_requests_total',
@@ -89,6 +92,10 @@ SECURITY_EVENTS = Counter(
     ['event_type', 'severity']
 )
 
+def _new_id() -> str:
+    """Random 128-bit id as 32 hex characters; same entropy as uuid4 without the UUID object"""
+    return os.urandom(16).hex()
+
 class MetricType(Enum):
     COUNTER = "counter"
     GAUGE = "gauge"
@@ -119,6 +126,23 @@ class TraceSpan:
         if self.logs is None:
             self.logs = []
 
+class LazyTraceback:
+    """
+    Exception traceback that is only rendered to text when read. Frame summaries are
+    captured without source lines or frame references; str() formats them once.
+    """
+    
+    def __init__(self, exc: BaseException):
+        self._traceback = traceback.TracebackException.from_exception(exc, lookup_lines=False)
+        self._text: Optional[str] = None
+    
+    def __str__(self) -> str:
+        if self._text is None:
+            self._text = "".join(self._traceback.format())
+        return self._text
+    
+    __repr__ = __str__
+
 @dataclass
 class SystemAlert:
     alert_id: str
@@ -130,21 +154,126 @@ class SystemAlert:
     threshold: float
     message: str
     tags: Dict[str, Any] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-ready form, built field by field rather than through asdict()"""
+        return {
+            'alert_id': self.alert_id,
+            'timestamp': self.timestamp.isoformat(),
+            'level': self.level.value,
+            'component': self.component,
+            'metric_name': self.metric_name,
+            'current_value': self.current_value,
+            'threshold': self.threshold,
+            'message': self.message,
+            'tags': dict(self.tags) if self.tags else {}
+        }
+
+class MetricRingBuffer:
+    """
+    Fixed-size ring of (timestamp, value) points for one custom metric, stored as two
+    float64 arrays. Tags are kept sparsely by slot since most points carry none.
+    """
+    
+    def __init__(self, name: str, metric_type: MetricType, capacity: int = 1000):
+        self.name = name
+        self.metric_type = metric_type
+        self.capacity = capacity
+        self.timestamps = np.empty(capacity, dtype=np.float64)
+        self.values = np.empty(capacity, dtype=np.float64)
+        self.tags: Dict[int, Dict[str, str]] = {}
+        self.head = 0
+        self.count = 0
+        self._lock = threading.Lock()
+    
+    def append(self, timestamp: float, value: float, tags: Optional[Dict[str, str]] = None):
+        """Write a point into the next slot, overwriting the oldest once full"""
+        with self._lock:
+            head = self.head
+            self.timestamps[head] = timestamp
+            self.values[head] = value
+            if tags:
+                self.tags[head] = tags
+            elif self.tags:
+                self.tags.pop(head, None)
+            self.head = (head + 1) % self.capacity
+            if self.count < self.capacity:
+                self.count += 1
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def _order(self) -> np.ndarray:
+        """Slot indices from oldest to newest"""
+        start = (self.head - self.count) % self.capacity
+        return (start + np.arange(self.count)) % self.capacity
+    
+    def series(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Copies of the timestamps and values, oldest first"""
+        with self._lock:
+            order = self._order()
+            return self.timestamps[order], self.values[order]
+    
+    def records(self) -> List[Dict[str, Any]]:
+        """Points as metric dicts, oldest first"""
+        with self._lock:
+            order = self._order()
+            metric_type = self.metric_type.value
+            return [
+                {
+                    'name': self.name,
+                    'value': float(self.values[i]),
+                    'type': metric_type,
+                    'timestamp': float(self.timestamps[i]),
+                    'tags': dict(self.tags.get(i, {}))
+                }
+                for i in order.tolist()
+            ]
 
 class MetricsCollector:
     """Advanced metrics collection and aggregation"""
     
-    def __init__(self):
-        self.logger = logging.getLogger(__name__)
-        self.custom_metrics = defaultdict(list)
-        self.metric_history = defaultdict(lambda: deque(maxlen=1000))
-        self.alerts = []
+    def __init__(self, metric_buffer_size: int = 1000):
+        self.logger = logger
+        # Per-metric ring buffers: the newest metric_buffer_size points are kept
+        self.metric_buffer_size = metric_buffer_size
+        self.custom_metrics: Dict[str, MetricRingBuffer] = {}
+        # Only the last 100 alerts are kept; older ones fall off the front
+        self.alerts = deque(maxlen=100)
+        # to_dict() of each alert, built once when the alert is created
+        self._alert_dicts = deque(maxlen=100)
         self.alert_thresholds = self._initialize_alert_thresholds()
+        # History for the alerting metrics is pre-registered; other names are added on first use
+        self.metric_history: Dict[str, deque] = {
+            name: deque(maxlen=self.metric_buffer_size) for name in self.alert_thresholds
+        }
+        
+        # Request metrics are buffered here and pushed to Prometheus by the flush thread,
+        # keyed by (method, endpoint, status_code, user_type) -> observed durations
+        self._pending_lock = threading.Lock()
+        self._pending_requests = defaultdict(list)
+        # Labelled Prometheus children per (metric, label values), so hot paths skip labels()
+        self._label_cache: Dict[Tuple, Any] = {}
+        self.flush_interval = 1.0
+        
+        # Each system metrics pass wakes every core, so sample sparingly
+        self.system_metrics_interval = float(os.getenv('SYSTEM_METRICS_INTERVAL', '60'))
+        # CPU is a cheap non-blocking read, so it is sampled on its own faster cadence
+        self.cpu_metrics_interval = float(os.getenv('CPU_METRICS_INTERVAL', '5'))
+        # Seconds cpu_percent blocks per sample; 0 measures usage since the previous pass
+        self.cpu_sample_window = float(os.getenv('CPU_SAMPLE_WINDOW', '0'))
+        self.last_cpu_percent: Optional[float] = None
+        # Latest system sample, served by get_metrics_summary without new syscalls
+        self._last_system: Dict[str, float] = {}
         
         # Start system metrics collection thread
         self.metrics_thread = threading.Thread(target=self._collect_system_metrics, daemon=True)
         self.metrics_thread.start()
         
+        # Start request metrics flush thread
+        self.flush_thread = threading.Thread(target=self._flush_request_metrics_loop, daemon=True)
+        self.flush_thread.start()
+        
     def _initialize_alert_thresholds(self) -> Dict[str, Dict[str, float]]:
         """Initialize alert thresholds for various metrics"""
         return {
@@ -158,91 +287,138 @@ class MetricsCollector:
     
     def record_request_metrics(self, method: str, endpoint: str, status_code: int,
                               duration: float, user_type: str = "anonymous"):
-        """Record HTTP request metrics"""
-        REQUEST_COUNT.labels(
-            method=method,
-            endpoint=endpoint,
-            status_code=status_code,
-            user_type=user_type
-        ).inc()
-        
-        REQUEST_DURATION.labels(
-            method=method,
-            endpoint=endpoint,
-            status_code=status_code
-        ).observe(duration)
+        """Record HTTP request metrics (buffered until the next flush)"""
+        key = (method, endpoint, status_code, user_type)
+        with self._pending_lock:
+            self._pending_requests[key].append(duration)
+    
+    def flush_request_metrics(self):
+        """Push buffered request metrics to Prometheus"""
+        with self._pending_lock:
+            pending, self._pending_requests = self._pending_requests, defaultdict(list)
+        
+        for key, durations in pending.items():
+            method, endpoint, status_code, user_type = key
+            self._child(REQUEST_COUNT, method, endpoint, status_code, user_type).inc(len(durations))
+            
+            # Histogram buckets need every observation, not just the sum
+            request_duration = self._child(REQUEST_DURATION, method, endpoint, status_code)
+            for duration in durations:
+                request_duration.observe(duration)
+    
+    def _child(self, metric, *label_values):
+        """metric.labels(*label_values), cached; values are in the metric's labelnames order"""
+        key = (metric, label_values)
+        child = self._label_cache.get(key)
+        if child is None:
+            child = self._label_cache[key] = metric.labels(*label_values)
+        return child
+    
+    def _flush_request_metrics_loop(self):
+        """Flush buffered request metrics in background thread"""
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush_request_metrics()
+            except Exception as e:
+                self.logger.error(f"Request metrics flush error: {str(e)}")
     
     def record_matching_metrics(self, algorithm: str, accuracy: float, duration: float):
         """Record identity matching metrics"""
         MATCHING_ACCURACY.observe(accuracy)
-        MATCHING_DURATION.labels(algorithm_type=algorithm).observe(duration)
+        self._child(MATCHING_DURATION, algorithm).observe(duration)
     
     def record_database_operation(self, operation: str, table: str, status: str):
         """Record database operation metrics"""
-        DATABASE_OPERATIONS.labels(
-            operation=operation,
-            table=table,
-            status=status
-        ).inc()
+        self._child(DATABASE_OPERATIONS, operation, table, status).inc()
     
     def record_cache_operation(self, operation: str, status: str):
         """Record cache operation metrics"""
-        CACHE_OPERATIONS.labels(
-            operation=operation,
-            status=status
-        ).inc()
+        self._child(CACHE_OPERATIONS, operation, status).inc()
     
     def record_security_event(self, event_type: str, severity: str):
         """Record security event metrics"""
-        SECURITY_EVENTS.labels(
-            event_type=event_type,
-            severity=severity
-        ).inc()
+        self._child(SECURITY_EVENTS, event_type, severity).inc()
     
     def record_custom_metric(self, name: str, value: float, metric_type: MetricType,
                            tags: Dict[str, str] = None):
         """Record custom application metrics"""
         timestamp = time.time()
-        metric_data = {
-            'name': name,
-            'value': value,
-            'type': metric_type.value,
-            'timestamp': timestamp,
-            'tags': tags or {}
-        }
         
-        self.custom_metrics[name].append(metric_data)
-        self.metric_history[name].append((timestamp, value))
+        buffer = self.custom_metrics.get(name)
+        if buffer is None:
+            buffer = self.custom_metrics.setdefault(
+                name, MetricRingBuffer(name, metric_type, self.metric_buffer_size)
+            )
+        buffer.metric_type = metric_type
+        buffer.append(timestamp, value, tags)
+        history = self.metric_history.get(name)
+        if history is None:
+            history = self.metric_history.setdefault(name, deque(maxlen=self.metric_buffer_size))
+        history.append((timestamp, value))
         
         # Check for alerts
         self._check_alert_conditions(name, value)
     
     def _collect_system_metrics(self):
-        """Collect system-level metrics in background thread"""
+        """
+        Collect system-level metrics in background thread. CPU and memory/disk run on
+        separate cadences, each scheduled against monotonic deadlines so collection
+        time doesn't stretch the period.
+        """
+        # Prime the CPU counter; each later interval=None call reports usage since the
+        # previous one instead of blocking for a sampling window
+        psutil.cpu_percent(interval=None)
+        next_cpu = next_system = time.monotonic() + 1.0
+        
         while True:
-            try:
-                # CPU usage
-                cpu_percent = psutil.cpu_percent(interval=1)
-                SYSTEM_CPU_USAGE.set(cpu_percent)
-                self._check_alert_conditions('cpu_usage', cpu_percent)
-                
-                # Memory usage
-                memory = psutil.virtual_memory()
-                SYSTEM_MEMORY_USAGE.set(memory.percent)
-                self._check_alert_conditions('memory_usage', memory.percent)
-                
-                # Disk usage
-                disk = psutil.disk_usage('/')
-                disk_percent = (disk.used / disk.total) * 100
-                SYSTEM_DISK_USAGE.set(disk_percent)
-                self._check_alert_conditions('disk_usage', disk_percent)
-                
-                # Sleep for 30 seconds between collections
-                time.sleep(30)
-                
-            except Exception as e:
-                self.logger.error(f"System metrics collection error: {str(e)}")
-                time.sleep(60)  # Wait longer on error
+            time.sleep(max(0.0, min(next_cpu, next_system) - time.monotonic()))
+            now = time.monotonic()
+            
+            if now >= next_cpu:
+                try:
+                    self._collect_cpu_metrics()
+                    next_cpu += self.cpu_metrics_interval
+                except Exception as e:
+                    self.logger.error(f"CPU metrics collection error: {str(e)}")
+                    next_cpu += 2 * self.cpu_metrics_interval  # Wait longer on error
+                # After a stall (e.g. host suspend) skip the missed ticks rather than bursting
+                next_cpu = max(next_cpu, now)
+            
+            if now >= next_system:
+                try:
+                    self._collect_resource_metrics()
+                    next_system += self.system_metrics_interval
+                except Exception as e:
+                    self.logger.error(f"System metrics collection error: {str(e)}")
+                    next_system += 2 * self.system_metrics_interval  # Wait longer on error
+                next_system = max(next_system, now)
+    
+    def _collect_cpu_metrics(self):
+        cpu_percent = psutil.cpu_percent(interval=self.cpu_sample_window or None)
+        self.last_cpu_percent = cpu_percent
+        SYSTEM_CPU_USAGE.set(cpu_percent)
+        self._check_alert_conditions('cpu_usage', cpu_percent)
+        self._last_system = {**self._last_system, 'cpu_usage': cpu_percent}
+    
+    def _collect_resource_metrics(self):
+        # Memory usage
+        memory = psutil.virtual_memory()
+        SYSTEM_MEMORY_USAGE.set(memory.percent)
+        self._check_alert_conditions('memory_usage', memory.percent)
+        
+        # Disk usage
+        disk = psutil.disk_usage('/')
+        disk_percent = (disk.used / disk.total) * 100
+        SYSTEM_DISK_USAGE.set(disk_percent)
+        self._check_alert_conditions('disk_usage', disk_percent)
+        
+        self._last_system = {
+            **self._last_system,
+            'memory_usage': memory.percent,
+            'disk_usage': disk_percent,
+            'active_processes': len(psutil.pids())
+        }
     
     def _check_alert_conditions(self, metric_name: str, value: float):
         """Check if metric value triggers alerts"""
@@ -262,7 +438,7 @@ class MetricsCollector:
     def _create_alert(self, metric_name: str, value: float, level: AlertLevel, threshold: float):
         """Create and store alert"""
         alert = SystemAlert(
-            alert_id=str(uuid.uuid4()),
+            alert_id=_new_id(),
             timestamp=datetime.utcnow(),
             level=level,
             component="system",
@@ -274,50 +450,72 @@ class MetricsCollector:
         )
         
         self.alerts.append(alert)
+        self._alert_dicts.append(alert.to_dict())
         self.logger.warning(f"ALERT: {alert.message}")
-        
-        # Keep only last 100 alerts
-        if len(self.alerts) > 100:
-            self.alerts = self.alerts[-100:]
     
     def get_metrics_summary(self) -> Dict[str, Any]:
         """Get comprehensive metrics summary"""
-        return {
-            'system_metrics': {
+        system_metrics = self._last_system
+        if not system_metrics:
+            # Nothing collected yet; sample once directly
+            disk = psutil.disk_usage('/')
+            system_metrics = {
                 'cpu_usage': psutil.cpu_percent(),
                 'memory_usage': psutil.virtual_memory().percent,
-                'disk_usage': (psutil.disk_usage('/').used / psutil.disk_usage('/').total) * 100,
+                'disk_usage': (disk.used / disk.total) * 100,
                 'active_processes': len(psutil.pids())
-            },
+            }
+        
+        return {
+            'system_metrics': system_metrics,
             'application_metrics': {
                 'custom_metrics_count': len(self.custom_metrics),
                 'total_alerts': len(self.alerts),
                 'active_alerts': len([a for a in self.alerts if a.level in [AlertLevel.WARNING, AlertLevel.CRITICAL]])
             },
-            'recent_alerts': [asdict(alert) for alert in self.alerts[-10:]]
+            'recent_alerts': list(self._alert_dicts)[-10:]
         }
 
 class DistributedTracing:
     """Distributed tracing for request flow analysis"""
     
     def __init__(self):
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
         self.active_traces = {}
         self.completed_traces = deque(maxlen=1000)
+        # trace_id -> its active and retained completed spans, oldest trace first. Capped so
+        # traces whose spans never finish are eventually dropped along with those spans
+        self.trace_index: "OrderedDict[str, List[TraceSpan]]" = OrderedDict()
+        self.max_indexed_traces = 10000
+        self._index_lock = threading.Lock()
+        
+        # Finished spans are stored and logged by a background thread, off the request path
+        self._finished_spans = queue.SimpleQueue()
+        self.finish_thread = threading.Thread(target=self._process_finished_spans, daemon=True)
+        self.finish_thread.start()
         
     def start_trace(self, operation_name: str, trace_id: str = None) -> TraceSpan:
         """Start a new trace span"""
         if trace_id is None:
-            trace_id = str(uuid.uuid4())
+            trace_id = _new_id()
         
         span = TraceSpan(
             trace_id=trace_id,
-            span_id=str(uuid.uuid4()),
+            span_id=_new_id(),
             operation_name=operation_name,
             start_time=time.time()
         )
         
         self.active_traces[span.span_id] = span
+        with self._index_lock:
+            spans = self.trace_index.get(trace_id)
+            if spans is None:
+                spans = self.trace_index[trace_id] = []
+                if len(self.trace_index) > self.max_indexed_traces:
+                    _, evicted = self.trace_index.popitem(last=False)
+                    for evicted_span in evicted:
+                        self.active_traces.pop(evicted_span.span_id, None)
+            spans.append(span)
         return span
     
     def finish_span(self, span: TraceSpan, status: str = "ok", tags: Dict[str, Any] = None):
@@ -329,14 +527,24 @@ class DistributedTracing:
         if tags:
             span.tags.update(tags)
         
-        # Move to completed traces
-        if span.span_id in self.active_traces:
-            del self.active_traces[span.span_id]
-        
-        self.completed_traces.append(span)
-        
-        # Log trace completion
-        self.logger.info(f"Trace completed: {span.operation_name} [{span.duration_ms:.2f}ms]")
+        self.active_traces.pop(span.span_id, None)
+        self._finished_spans.put(span)
+    
+    def _process_finished_spans(self):
+        """Move finished spans to completed traces and log them in background thread"""
+        while True:
+            span = self._finished_spans.get()
+            try:
+                with self._index_lock:
+                    if len(self.completed_traces) == self.completed_traces.maxlen:
+                        # The deque is about to drop its oldest span; drop it from the index too
+                        self._unindex(self.completed_traces.popleft())
+                    self.completed_traces.append(span)
+                
+                # Log trace completion
+                self.logger.info(f"Trace completed: {span.operation_name} [{span.duration_ms:.2f}ms]")
+            except Exception as e:
+                self.logger.error(f"Trace completion error: {str(e)}")
     
     def add_span_log(self, span: TraceSpan, level: str, message: str, data: Dict[str, Any] = None):
         """Add log entry to span"""
@@ -350,27 +558,32 @@ class DistributedTracing:
     
     def get_trace_by_id(self, trace_id: str) -> List[TraceSpan]:
         """Get all spans for a trace ID"""
-        spans = []
-        
-        # Check active traces
-        for span in self.active_traces.values():
-            if span.trace_id == trace_id:
-                spans.append(span)
-        
-        # Check completed traces
-        for span in self.completed_traces:
-            if span.trace_id == trace_id:
-                spans.append(span)
-        
+        with self._index_lock:
+            spans = list(self.trace_index.get(trace_id, ()))
         return sorted(spans, key=lambda s: s.start_time)
+    
+    def _unindex(self, span: TraceSpan):
+        """Remove an evicted span from the trace index; caller holds _index_lock"""
+        spans = self.trace_index.get(span.trace_id)
+        if spans is None:
+            return
+        try:
+            spans.remove(span)
+        except ValueError:
+            pass
+        if not spans:
+            del self.trace_index[span.trace_id]
 
 class HealthChecker:
     """Comprehensive health checking system"""
     
-    def __init__(self):
-        self.logger = logging.getLogger(__name__)
+    def __init__(self, metrics_collector: Optional[MetricsCollector] = None):
+        self.logger = logger
         self.health_checks = {}
         self.health_status = {}
+        # The CPU check reuses the collector's latest sample rather than measuring again
+        self.metrics_collector = metrics_collector
+        self.cpu_interval = float(os.getenv('HEALTH_CHECK_CPU_INTERVAL', '0'))
         
         # Register default health checks
         self._register_default_checks()
@@ -387,41 +600,50 @@ class HealthChecker:
         self.logger.info(f"Registered health check: {name}")
     
     async def run_health_checks(self) -> Dict[str, Any]:
-        """Run all registered health checks"""
+        """Run all registered health checks concurrently"""
+        loop = asyncio.get_running_loop()
+        names = list(self.health_checks)
+        outcomes = await asyncio.gather(
+            *(loop.run_in_executor(None, self.health_checks[name]) for name in names),
+            return_exceptions=True
+        )
+        # One timestamp for the whole run; the checks finish within moments of each other
+        now = datetime.now(timezone.utc).isoformat()
+        
         results = {}
         overall_healthy = True
         
-        for name, check_func in self.health_checks.items():
-            try:
-                result = await asyncio.get_event_loop().run_in_executor(None, check_func)
-                results[name] = result
-                
-                if not result.get('healthy', False):
-                    overall_healthy = False
-                    
-            except Exception as e:
-                self.logger.error(f"Health check {name} failed: {str(e)}")
+        for name, outcome in zip(names, outcomes):
+            if isinstance(outcome, Exception):
+                self.logger.error(f"Health check {name} failed: {str(outcome)}")
                 results[name] = {
                     'healthy': False,
-                    'error': str(e),
-                    'timestamp': datetime.utcnow().isoformat()
+                    'error': str(outcome),
+                    'timestamp': now
                 }
                 overall_healthy = False
+                continue
+            
+            outcome.setdefault('timestamp', now)
+            results[name] = outcome
+            if not outcome.get('healthy', False):
+                overall_healthy = False
         
         return {
             'healthy': overall_healthy,
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': now,
             'checks': results
         }
     
     def _check_cpu_health(self) -> Dict[str, Any]:
         """Check CPU health"""
-        cpu_percent = psutil.cpu_percent(interval=1)
+        cpu_percent = self.metrics_collector.last_cpu_percent if self.metrics_collector else None
+        if cpu_percent is None:
+            cpu_percent = psutil.cpu_percent(interval=self.cpu_interval or None)
         return {
             'healthy': cpu_percent < 90,
             'cpu_usage': cpu_percent,
-            'threshold': 90,
-            'timestamp': datetime.utcnow().isoformat()
+            'threshold': 90
         }
     
     def _check_memory_health(self) -> Dict[str, Any]:
@@ -431,8 +653,7 @@ class HealthChecker:
             'healthy': memory.percent < 95,
             'memory_usage': memory.percent,
             'available_gb': memory.available / (1024**3),
-            'threshold': 95,
-            'timestamp': datetime.utcnow().isoformat()
+            'threshold': 95
         }
     
     def _check_disk_health(self) -> Dict[str, Any]:
@@ -443,8 +664,7 @@ class HealthChecker:
             'healthy': usage_percent < 95,
             'disk_usage': usage_percent,
             'free_gb': disk.free / (1024**3),
-            'threshold': 95,
-            'timestamp': datetime.utcnow().isoformat()
+            'threshold': 95
         }
 
 class MonitoringMiddleware(BaseHTTPMiddleware):
@@ -452,11 +672,21 @@ class MonitoringMiddleware(BaseHTTPMiddleware):
     
     def __init__(self, app):
         super().__init__(app)
-        self.metrics_collector = MetricsCollector()
+        # The module-level collector, so get_prometheus_metrics() flushes what this middleware buffers
+        # and only one set of sampling/flush threads runs
+        self.metrics_collector = metrics_collector
         self.tracer = DistributedTracing()
-        self.health_checker = HealthChecker()
-        self.logger = logging.getLogger(__name__)
+        self.health_checker = health_checker
+        self.logger = logger
+        # Trace headers are only useful when something downstream propagates them
+        self.emit_trace_headers = os.getenv('IDXR_EMIT_TRACE_HEADERS', 'true').lower() == 'true'
         
+    @staticmethod
+    def _endpoint_label(request: Request) -> str:
+        """Matched route template for the request, or the raw path if no route matched"""
+        route = request.scope.get('route')
+        return route.path if route is not None else request.url.path
+    
     async def dispatch(self, request: Request, call_next: Callable):
         """Process request with monitoring"""
         # Start trace
@@ -491,18 +721,23 @@ class MonitoringMiddleware(BaseHTTPMiddleware):
             if request.headers.get('authorization'):
                 user_type = "authenticated"
             
+            # Label by route template (/users/{id}) so series stay bounded by the route table
+            endpoint = self._endpoint_label(request)
+            span.operation_name = f"{request.method} {endpoint}"
+            
             # Record metrics
             self.metrics_collector.record_request_metrics(
                 request.method,
-                request.url.path,
+                endpoint,
                 status_code,
                 duration,
                 user_type
             )
             
             # Add response headers for observability
-            response.headers["X-Trace-Id"] = span.trace_id
-            response.headers["X-Processing-Time"] = f"{duration:.3f}"
+            if self.emit_trace_headers:
+                response.headers["X-Trace-Id"] = span.trace_id
+                response.headers["X-Processing-Time"] = format(duration, '.3f')
             
             # Finish trace with success
             self.tracer.finish_span(span, "ok", {
@@ -518,7 +753,7 @@ class MonitoringMiddleware(BaseHTTPMiddleware):
             duration = time.time() - start_time
             self.metrics_collector.record_request_metrics(
                 request.method,
-                request.url.path,
+                self._endpoint_label(request),
                 500,
                 duration
             )
@@ -526,7 +761,7 @@ class MonitoringMiddleware(BaseHTTPMiddleware):
             # Add error to trace
             self.tracer.add_span_log(span, "error", str(e), {
                 'exception_type': type(e).__name__,
-                'traceback': traceback.format_exc()
+                'traceback': LazyTraceback(e)
             })
             
             # Finish trace with error
@@ -545,41 +780,35 @@ class MonitoringMiddleware(BaseHTTPMiddleware):
 def monitor_function_execution(operation_name: str = None):
     """Decorator for monitoring function execution"""
     def decorator(func):
+        # Resolved once per decorated function rather than on every call
+        name = operation_name or f"{func.__module__}.{func.__name__}"
+        
         async def async_wrapper(*args, **kwargs):
-            name = operation_name or f"{func.__module__}.{func.__name__}"
-            
-            # Create span for function execution
-            tracer = DistributedTracing()
-            span = tracer.start_trace(name)
+            # Record the span on the shared tracer so get_trace_by_id can find it
+            span = distributed_tracer.start_trace(name)
             
             try:
                 result = await func(*args, **kwargs)
-                tracer.finish_span(span, "ok")
+                distributed_tracer.finish_span(span, "ok")
                 return result
             except Exception as e:
-                tracer.add_span_log(span, "error", str(e))
-                tracer.finish_span(span, "error")
+                distributed_tracer.add_span_log(span, "error", str(e))
+                distributed_tracer.finish_span(span, "error")
                 raise
         
         def sync_wrapper(*args, **kwargs):
-            name = operation_name or f"{func.__module__}.{func.__name__}"
-            
-            start_time = time.time()
+            start_time = time.perf_counter()
             try:
                 result = func(*args, **kwargs)
-                duration = time.time() - start_time
+                duration = time.perf_counter() - start_time
                 
                 # Log execution metrics
-                logging.getLogger(__name__).info(
-                    f"Function executed: {name} [{duration*1000:.2f}ms]"
-                )
+                logger.info("Function executed: %s [%.2fms]", name, duration * 1000)
                 
                 return result
             except Exception as e:
-                duration = time.time() - start_time
-                logging.getLogger(__name__).error(
-                    f"Function failed: {name} [{duration*1000:.2f}ms] - {str(e)}"
-                )
+                duration = time.perf_counter() - start_time
+                logger.error("Function failed: %s [%.2fms] - %s", name, duration * 1000, e)
                 raise
         
         if asyncio.iscoroutinefunction(func):
@@ -591,9 +820,11 @@ def monitor_function_execution(operation_name: str = None):
 
 def get_prometheus_metrics() -> str:
     """Get Prometheus metrics in text format"""
+    # Don't make scrapes wait up to a flush interval for buffered requests
+    metrics_collector.flush_request_metrics()
     return prometheus_client.generate_latest().decode('utf-8')
 
 # Global instances for easy access
 metrics_collector = MetricsCollector()
 distributed_tracer = DistributedTracing()
-health_checker = HealthChecker()
\ No newline at end of file
+health_checker = HealthChecker(metrics_collector)
\ No newline at end of file
@@ -6,6 +6,7 @@ Provides comprehensive system administration and management capabilities
 import asyncio
 import json
 import logging
+import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
@@ -71,15 +72,31 @@ class SystemMonitor:
             'response_time_warning': 2000
         }
         
+        # Prime the CPU counter so each interval=None read reports usage since the last one
+        psutil.cpu_percent(interval=None)
+        
+        # Disk totals change slowly; re-read them at most once per disk_usage_ttl seconds
+        self.disk_usage_ttl = 60.0
+        self._disk_usage = None
+        self._disk_usage_expires = 0.0
+        
+    def _get_disk_usage(self):
+        """psutil.disk_usage('/'), cached for disk_usage_ttl seconds"""
+        now = time.monotonic()
+        if self._disk_usage is None or now >= self._disk_usage_expires:
+            self._disk_usage = psutil.disk_usage('/')
+            self._disk_usage_expires = now + self.disk_usage_ttl
+        return self._disk_usage
+    
     def collect_metrics(self) -> SystemMetrics:
         """Collect current system metrics"""
         try:
             # CPU and memory usage
-            cpu_percent = psutil.cpu_percent(interval=1)
+            cpu_percent = psutil.cpu_percent(interval=None)
             memory = psutil.virtual_memory()
             
             # Disk usage
-            disk = psutil.disk_usage('/')
+            disk = self._get_disk_usage()
             
             # Network I/O
             net_io = psutil.net_io_counters()
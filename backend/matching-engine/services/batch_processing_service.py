@@ -274,7 +274,7 @@ class BatchProcessingService:
         self,
         job_id: str,
         page: int = 1,
-        limit: int = 1000000,
+        limit: int = 1000,
         status_filter: Optional[str] = None
     ) -> Dict[str, Any]:
         """Get results for a completed batch job"""
@@ -300,6 +300,22 @@ class BatchProcessingService:
             "results": results
         }
     
+    async def iter_job_results(
+        self,
+        job_id: str,
+        status_filter: Optional[str] = None,
+        chunk_size: int = 1000
+    ):
+        """Yield results for a completed batch job one record at a time, reading chunk_size rows at once"""
+        
+        job = self.jobs.get(job_id)
+        if not job or job.status != JobStatus.COMPLETED:
+            raise ValueError("Job not found or not completed")
+        
+        async for chunk in self._iter_result_chunks(job_id, status_filter, chunk_size):
+            for record in chunk.to_dict('records'):
+                yield record
+    
     async def get_queue_statistics(self) -> Dict[str, Any]:
         """Get current queue statistics"""
         
@@ -334,14 +350,12 @@ class BatchProcessingService:
         if not job or job.status != JobStatus.COMPLETED:
             raise ValueError("Job not found or not completed")
             
-        results = await self._load_all_job_results(job_id)
-        
         if format.lower() == "csv":
-            return await self._export_to_csv(job_id, results)
+            return await self._export_to_csv(job_id)
         elif format.lower() == "json":
-            return await self._export_to_json(job_id, results)
+            return await self._export_to_json(job_id)
         elif format.lower() == "excel":
-            return await self._export_to_excel(job_id, results)
+            return await self._export_to_excel(job_id, await self._load_all_job_results(job_id))
         else:
             raise ValueError("Unsupported export format")
     
@@ -1085,6 +1099,31 @@ class BatchProcessingService:
                     writer.writeheader()
                 writer.writerows(result_dicts)
     
+    async def _iter_result_chunks(
+        self,
+        job_id: str,
+        status_filter: Optional[str] = None,
+        chunk_size: int = 1000
+    ):
+        """Read a job's results file in chunks off the event loop, applying the status filter"""
+        output_path = f"data/batch_outputs/{job_id}_results.csv"
+        
+        if not Path(output_path).exists():
+            return
+        
+        reader = pd.read_csv(output_path, chunksize=chunk_size)
+        try:
+            while True:
+                chunk = await asyncio.to_thread(next, reader, None)
+                if chunk is None:
+                    break
+                if status_filter:
+                    chunk = chunk[chunk['status'] == status_filter]
+                if not chunk.empty:
+                    yield chunk
+        finally:
+            reader.close()
+    
     async def _load_job_results(
         self,
         job_id: str,
@@ -1092,22 +1131,26 @@ class BatchProcessingService:
         limit: int,
         status_filter: Optional[str]
     ) -> List[Dict]:
-        """Load paginated job results"""
-        output_path = f"data/batch_outputs/{job_id}_results.csv"
-        
-        if not Path(output_path).exists():
+        """Load paginated job results, holding at most one chunk beyond the page in memory"""
+        skip = (page - 1) * limit
+        pages = []
+        remaining = limit
+        
+        async for chunk in self._iter_result_chunks(job_id, status_filter, max(limit, 1000)):
+            if skip >= len(chunk):
+                skip -= len(chunk)
+                continue
+            
+            page_rows = chunk.iloc[skip:skip + remaining]
+            skip = 0
+            pages.append(page_rows)
+            remaining -= len(page_rows)
+            if remaining <= 0:
+                break
+        
+        if not pages:
             return []
-        
-        df = pd.read_csv(output_path)
-        
-        if status_filter:
-            df = df[df['status'] == status_filter]
-        
-        # Apply pagination
-        start_idx = (page - 1) * limit
-        end_idx = start_idx + limit
-        
-        return df.iloc[start_idx:end_idx].to_dict('records')
+        return pd.concat(pages).to_dict('records')
     
     async def _load_all_job_results(self, job_id: str) -> List[Dict]:
         """Load all results for a job"""
@@ -1170,24 +1213,34 @@ class BatchProcessingService:
         else:
             return f"{int(estimated_seconds / 3600)} hours"
     
-    async def _export_to_csv(self, job_id: str, results: List[Dict]) -> str:
-        """Export results to CSV format"""
+    async def _export_to_csv(self, job_id: str) -> str:
+        """Export results to CSV format, copying the results file chunk by chunk"""
         output_path = f"data/exports/{job_id}_export.csv"
         Path(output_path).parent.mkdir(parents=True, exist_ok=True)
         
-        if results:
-            df = pd.DataFrame(results)
-            df.to_csv(output_path, index=False)
+        header = True
+        async for chunk in self._iter_result_chunks(job_id, chunk_size=10000):
+            await asyncio.to_thread(
+                chunk.to_csv, output_path, mode='w' if header else 'a', header=header, index=False
+            )
+            header = False
         
         return output_path
     
-    async def _export_to_json(self, job_id: str, results: List[Dict]) -> str:
-        """Export results to JSON format"""
+    async def _export_to_json(self, job_id: str) -> str:
+        """Export results to JSON format, writing the array one chunk at a time"""
         output_path = f"data/exports/{job_id}_export.json"
         Path(output_path).parent.mkdir(parents=True, exist_ok=True)
         
         with open(output_path, 'w') as f:
-            json.dump(results, f, indent=2)
+            f.write('[')
+            first = True
+            async for chunk in self._iter_result_chunks(job_id, chunk_size=10000):
+                for record in chunk.to_dict('records'):
+                    f.write('\n  ' if first else ',\n  ')
+                    f.write(json.dumps(record, default=str))
+                    first = False
+            f.write('\n]' if not first else ']')
         
         return output_path
     
@@ -9,6 +9,10 @@ from abc import ABC, abstractmethod
 from enum import Enum
 from typing import Dict, List, Any, Optional, Union, Callable
 from dataclasses import dataclass
+from collections import OrderedDict
+import hashlib
+import numpy as np
+import orjson
 import pandas as pd
 import re
 import json
@@ -17,6 +21,14 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+def _empty_mask(values: pd.Series) -> pd.Series:
+    """Rows whose value is falsy (None, "", 0, ...), which transformers map to """""
+    return ~values.map(bool).astype(bool)
+
+def _as_str(values: pd.Series) -> pd.Series:
+    """str() of every value, as transform() does; astype(str) would leave NaN as NaN"""
+    return values.map(str)
+
 class TransformationType(Enum):
     """Types of data transformations"""
     FIELD_MAPPING = "field_mapping"
@@ -85,6 +97,36 @@ class DataTransformer(ABC):
     def validate(self, value: Any, parameters: Dict[str, Any] = None) -> bool:
         """Validate a transformed value"""
         pass
+    
+    def transform_column(self, values: pd.Series, parameters: Dict[str, Any] = None) -> pd.Series:
+        """
+        Transform a whole column. Falls back to transform() per distinct value;
+        subclasses override it with vectorized string operations.
+        """
+        transform = self._memoized(self.transform, parameters)
+        # Built explicitly as objects; Series.map would turn None results into NaN
+        return pd.Series([transform(value) for value in values], index=values.index, dtype=object)
+    
+    def validate_column(self, values: pd.Series, parameters: Dict[str, Any] = None) -> pd.Series:
+        """Validate a whole column, calling validate() once per distinct value"""
+        validate = self._memoized(self.validate, parameters)
+        return pd.Series([bool(validate(value)) for value in values], index=values.index, dtype=bool)
+    
+    @staticmethod
+    def _memoized(func: Callable, parameters: Optional[Dict[str, Any]]) -> Callable:
+        results = {}
+        
+        def call(value):
+            # Keyed on type too so 1, 1.0 and True don't share a result
+            try:
+                key = (type(value), value)
+                if key not in results:
+                    results[key] = func(value, parameters)
+                return results[key]
+            except TypeError:  # unhashable value
+                return func(value, parameters)
+        
+        return call
 
 class NameTransformer(DataTransformer):
     """Transformer for name fields"""
@@ -113,6 +155,26 @@ class NameTransformer(DataTransformer):
         
         return name_str.strip()
     
+    def transform_column(self, values: pd.Series, parameters: Dict[str, Any] = None) -> pd.Series:
+        """Vectorized transform()"""
+        names = _as_str(values).str.strip()
+        
+        if parameters:
+            if parameters.get("uppercase"):
+                names = names.str.upper()
+            elif parameters.get("lowercase"):
+                names = names.str.lower()
+            elif parameters.get("title_case"):
+                names = names.str.title()
+            
+            if parameters.get("remove_special_chars"):
+                names = names.str.replace(r'[^a-zA-Z\s-]', '', regex=True)
+            
+            if parameters.get("normalize_spaces"):
+                names = names.str.replace(r'\s+', ' ', regex=True)
+        
+        return names.str.strip().mask(_empty_mask(values), "")
+    
     def validate(self, value: Any, parameters: Dict[str, Any] = None) -> bool:
         """Validate name values"""
         if not value:
@@ -209,6 +271,35 @@ class PhoneTransformer(DataTransformer):
         
         return phone_str
     
+    def transform_column(self, values: pd.Series, parameters: Dict[str, Any] = None) -> pd.Series:
+        """Vectorized transform()"""
+        phones = _as_str(values).str.strip()
+        
+        if parameters:
+            target_format = parameters.get("format", "xxx-xxx-xxxx")
+            digits_only = phones.str.replace(r'\D', '', regex=True)
+            length = digits_only.str.len()
+            is_national = length == 10
+            # US numbers with country code are formatted from the last 10 digits
+            is_us = (length == 11) & digits_only.str.startswith('1')
+            national = digits_only.where(is_national, digits_only.str[1:])
+            
+            formatted = None
+            if target_format == "xxx-xxx-xxxx":
+                formatted = national.str[:3] + "-" + national.str[3:6] + "-" + national.str[6:]
+                eligible = is_national | is_us
+            elif target_format == "(xxx) xxx-xxxx":
+                formatted = "(" + national.str[:3] + ") " + national.str[3:6] + "-" + national.str[6:]
+                eligible = is_national | is_us
+            elif target_format == "xxxxxxxxxx":
+                formatted = digits_only
+                eligible = is_national
+            
+            if formatted is not None:
+                phones = formatted.where(eligible, phones)
+        
+        return phones.mask(_empty_mask(values), "")
+    
     def validate(self, value: Any, parameters: Dict[str, Any] = None) -> bool:
         """Validate phone numbers"""
         if not value:
@@ -228,6 +319,12 @@ class PhoneTransformer(DataTransformer):
 class EmailTransformer(DataTransformer):
     """Transformer for email fields"""
     
+    DOMAIN_MAPPINGS = {
+        "gmail.co": "gmail.com",
+        "yahoo.co": "yahoo.com",
+        "hotmail.co": "hotmail.com"
+    }
+    
     def transform(self, value: Any, parameters: Dict[str, Any] = None) -> str:
         """Transform email addresses"""
         if not value:
@@ -238,18 +335,22 @@ class EmailTransformer(DataTransformer):
         if parameters:
             if parameters.get("normalize_domain"):
                 # Normalize common domain variations
-                domain_mappings = {
-                    "gmail.co": "gmail.com",
-                    "yahoo.co": "yahoo.com",
-                    "hotmail.co": "hotmail.com"
-                }
-                
-                for old_domain, new_domain in domain_mappings.items():
+                for old_domain, new_domain in self.DOMAIN_MAPPINGS.items():
                     if old_domain in email_str:
                         email_str = email_str.replace(old_domain, new_domain)
         
         return email_str
     
+    def transform_column(self, values: pd.Series, parameters: Dict[str, Any] = None) -> pd.Series:
+        """Vectorized transform()"""
+        emails = _as_str(values).str.strip().str.lower()
+        
+        if parameters and parameters.get("normalize_domain"):
+            for old_domain, new_domain in self.DOMAIN_MAPPINGS.items():
+                emails = emails.str.replace(old_domain, new_domain, regex=False)
+        
+        return emails.mask(_empty_mask(values), "")
+    
     def validate(self, value: Any, parameters: Dict[str, Any] = None) -> bool:
         """Validate email addresses"""
         if not value:
@@ -286,6 +387,27 @@ class SSNTransformer(DataTransformer):
         
         return ssn_str
     
+    def transform_column(self, values: pd.Series, parameters: Dict[str, Any] = None) -> pd.Series:
+        """Vectorized transform()"""
+        ssns = _as_str(values).str.strip()
+        
+        if parameters:
+            target_format = parameters.get("format", "xxx-xx-xxxx")
+            digits_only = ssns.str.replace(r'\D', '', regex=True)
+            
+            formatted = None
+            if target_format == "xxx-xx-xxxx":
+                formatted = digits_only.str[:3] + "-" + digits_only.str[3:5] + "-" + digits_only.str[5:]
+            elif target_format == "xxxxxxxxx":
+                formatted = digits_only
+            elif target_format == "masked":
+                formatted = "XXX-XX-" + digits_only.str[5:]
+            
+            if formatted is not None:
+                ssns = formatted.where(digits_only.str.len() == 9, ssns)
+        
+        return ssns.mask(_empty_mask(values), "")
+    
     def validate(self, value: Any, parameters: Dict[str, Any] = None) -> bool:
         """Validate SSN"""
         if not value:
@@ -299,6 +421,20 @@ class SSNTransformer(DataTransformer):
 class AddressTransformer(DataTransformer):
     """Transformer for address fields"""
     
+    # Common address abbreviations
+    ABBREVIATIONS = {
+        r'\bStreet\b': 'St',
+        r'\bAvenue\b': 'Ave',
+        r'\bBoulevard\b': 'Blvd',
+        r'\bRoad\b': 'Rd',
+        r'\bDrive\b': 'Dr',
+        r'\bLane\b': 'Ln',
+        r'\bCourt\b': 'Ct',
+        r'\bPlace\b': 'Pl',
+        r'\bApartment\b': 'Apt',
+        r'\bSuite\b': 'Ste'
+    }
+    
     def transform(self, value: Any, parameters: Dict[str, Any] = None) -> str:
         """Transform address components"""
         if not value:
@@ -311,25 +447,25 @@ class AddressTransformer(DataTransformer):
                 address_str = address_str.title()
             
             if parameters.get("standardize_abbreviations"):
-                # Common address abbreviations
-                abbreviations = {
-                    r'\bStreet\b': 'St',
-                    r'\bAvenue\b': 'Ave',
-                    r'\bBoulevard\b': 'Blvd',
-                    r'\bRoad\b': 'Rd',
-                    r'\bDrive\b': 'Dr',
-                    r'\bLane\b': 'Ln',
-                    r'\bCourt\b': 'Ct',
-                    r'\bPlace\b': 'Pl',
-                    r'\bApartment\b': 'Apt',
-                    r'\bSuite\b': 'Ste'
-                }
-                
-                for full_form, abbrev in abbreviations.items():
+                for full_form, abbrev in self.ABBREVIATIONS.items():
                     address_str = re.sub(full_form, abbrev, address_str, flags=re.IGNORECASE)
         
         return address_str
     
+    def transform_column(self, values: pd.Series, parameters: Dict[str, Any] = None) -> pd.Series:
+        """Vectorized transform()"""
+        addresses = _as_str(values).str.strip()
+        
+        if parameters:
+            if parameters.get("normalize_case"):
+                addresses = addresses.str.title()
+            
+            if parameters.get("standardize_abbreviations"):
+                for full_form, abbrev in self.ABBREVIATIONS.items():
+                    addresses = addresses.str.replace(full_form, abbrev, flags=re.IGNORECASE, regex=True)
+        
+        return addresses.mask(_empty_mask(values), "")
+    
     def validate(self, value: Any, parameters: Dict[str, Any] = None) -> bool:
         """Validate address components"""
         if not value:
@@ -363,9 +499,31 @@ class DataTransformationService:
             FieldType.ADDRESS_STATE: AddressTransformer(),
             FieldType.ADDRESS_ZIP: AddressTransformer()
         }
+        # Parsed mapping configs keyed by content hash, least recently used first
+        self._mapping_configs: "OrderedDict[str, DataMappingConfig]" = OrderedDict()
+        self.mapping_config_cache_size = 1024
     
     async def create_mapping_config(self, mapping_data: Dict[str, Any]) -> DataMappingConfig:
-        """Create a data mapping configuration"""
+        """
+        Create a data mapping configuration. Clients resend the same mapping with every
+        request, so parsed configs are reused for identical mapping_data.
+        """
+        key = hashlib.blake2b(
+            orjson.dumps(mapping_data, option=orjson.OPT_SORT_KEYS), digest_size=16
+        ).hexdigest()
+        mapping_config = self._mapping_configs.get(key)
+        if mapping_config is not None:
+            self._mapping_configs.move_to_end(key)
+            return mapping_config
+        
+        mapping_config = self._parse_mapping_config(mapping_data)
+        self._mapping_configs[key] = mapping_config
+        if len(self._mapping_configs) > self.mapping_config_cache_size:
+            self._mapping_configs.popitem(last=False)
+        return mapping_config
+    
+    def _parse_mapping_config(self, mapping_data: Dict[str, Any]) -> DataMappingConfig:
+        """Build a DataMappingConfig from its JSON form"""
         try:
             field_mappings = []
             for field_data in mapping_data.get("field_mappings", []):
@@ -407,46 +565,70 @@ class DataTransformationService:
             raise
     
     async def apply_transformations(self, data: List[Dict[str, Any]], mapping_config: DataMappingConfig) -> List[Dict[str, Any]]:
-        """Apply transformations to data based on mapping configuration"""
+        """
+        Apply transformations to data based on mapping configuration. Field mappings
+        run column-wise over the whole dataset; global rules are applied per record.
+        """
         try:
-            transformed_data = []
+            if not data:
+                return []
             
-            for record in data:
-                transformed_record = {}
+            # Extract each source column once as objects so values keep their Python types
+            # (a DataFrame would coerce e.g. [7, None] to [7.0, NaN])
+            source_columns: Dict[str, pd.Series] = {}
+            columns: Dict[str, pd.Series] = {}
+            present: Dict[str, np.ndarray] = {}
+            
+            # Apply field mappings
+            for field_mapping in mapping_config.field_mappings:
+                source_field = field_mapping.source_field
+                if source_field not in source_columns:
+                    source_columns[source_field] = pd.Series([record.get(source_field) for record in data], dtype=object)
+                values = source_columns[source_field]
                 
-                # Apply field mappings
-                for field_mapping in mapping_config.field_mappings:
-                    source_value = record.get(field_mapping.source_field)
-                    
-                    # Use default value if source is empty and default is provided
-                    if not source_value and field_mapping.default_value is not None:
-                        source_value = field_mapping.default_value
-                    
-                    # Apply field-specific transformations
-                    transformer = self.transformers.get(field_mapping.target_field)
-                    if transformer:
-                        for rule in field_mapping.transformation_rules:
-                            source_value = transformer.transform(source_value, rule.get("parameters", {}))
-                    
-                    # Validate transformed value
-                    is_valid = True
-                    if transformer:
-                        for rule in field_mapping.validation_rules:
-                            if not transformer.validate(source_value, rule.get("parameters", {})):
-                                is_valid = False
-                                break
-                    
-                    # Add to transformed record if valid or not required
-                    if is_valid or not field_mapping.is_required:
-                        transformed_record[field_mapping.target_field.value] = source_value
-                    elif field_mapping.is_required:
-                        logger.warning(f"Required field {field_mapping.target_field.value} failed validation")
+                # Use default value if source is empty and default is provided
+                if field_mapping.default_value is not None:
+                    values = values.mask(_empty_mask(values), field_mapping.default_value)
                 
-                # Apply global transformations
-                for rule in sorted(mapping_config.global_transformations, key=lambda x: x.priority):
-                    transformed_record = await self._apply_global_transformation(transformed_record, rule)
+                # Apply field-specific transformations
+                transformer = self.transformers.get(field_mapping.target_field)
+                if transformer:
+                    for rule in field_mapping.transformation_rules:
+                        values = transformer.transform_column(values, rule.get("parameters", {}))
                 
-                transformed_data.append(transformed_record)
+                # Validate transformed values
+                is_valid = np.ones(len(values), dtype=bool)
+                if transformer:
+                    for rule in field_mapping.validation_rules:
+                        is_valid &= transformer.validate_column(values, rule.get("parameters", {})).to_numpy()
+                
+                # Add to transformed records where valid or not required
+                keep = is_valid if field_mapping.is_required else np.ones(len(values), dtype=bool)
+                if not keep.all():
+                    logger.warning("Required field %s failed validation in %d records",
+                                   field_mapping.target_field.value, int((~keep).sum()))
+                
+                target = field_mapping.target_field.value
+                if target in columns:
+                    # np.where on object arrays; Series.where would turn None into NaN
+                    columns[target] = pd.Series(
+                        np.where(keep, values.to_numpy(dtype=object), columns[target].to_numpy(dtype=object)),
+                        dtype=object
+                    )
+                    present[target] = present[target] | keep
+                else:
+                    columns[target] = values
+                    present[target] = keep
+            
+            transformed_data = self._to_records(columns, present, len(data))
+            
+            # Apply global transformations
+            global_rules = sorted(mapping_config.global_transformations, key=lambda x: x.priority)
+            if global_rules:
+                for i, transformed_record in enumerate(transformed_data):
+                    for rule in global_rules:
+                        transformed_record = await self._apply_global_transformation(transformed_record, rule)
+                    transformed_data[i] = transformed_record
             
             return transformed_data
             
@@ -454,6 +636,21 @@ class DataTransformationService:
             logger.error(f"Error applying transformations: {str(e)}")
             raise
     
+    def _to_records(self, columns: Dict[str, pd.Series], present: Dict[str, np.ndarray],
+                    count: int) -> List[Dict[str, Any]]:
+        """Assemble per-record dicts, leaving out fields dropped by failed required validation"""
+        if not columns:
+            return [{} for _ in range(count)]
+        
+        # Zipped from object arrays rather than DataFrame.to_dict, which turns None into NaN
+        names = list(columns)
+        records = [dict(zip(names, row)) for row in zip(*(columns[name].to_numpy() for name in names))]
+        for name, keep in present.items():
+            if not keep.all():
+                for i in np.flatnonzero(~keep):
+                    del records[i][name]
+        return records
+    
     async def _apply_global_transformation(self, record: Dict[str, Any], rule: TransformationRule) -> Dict[str, Any]:
         """Apply a global transformation rule to a record"""
         try:
@@ -26,7 +26,7 @@ class HouseholdRelationship(Enum):
     OTHER_RELATIVE = "other_relative"
     UNRELATED = "unrelated"
 
-@dataclass
+@dataclass(slots=True)
 class HouseholdMember:
     identity_id: str
     relationship: HouseholdRelationship
@@ -36,7 +36,7 @@ class HouseholdMember:
     dependency_status: Optional[str] = None
     guardian_id: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class Household:
     household_id: str
     members: List[HouseholdMember]
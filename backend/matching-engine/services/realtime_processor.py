@@ -8,7 +8,8 @@ import logging
 import time
 from typing import Dict, List, Optional, Tuple, Any, Callable
 from dataclasses import dataclass, asdict
-from enum import Enum
+from enum import Enum, IntEnum
+import itertools
 import json
 import uuid
 from datetime import datetime, timedelta
@@ -22,7 +23,7 @@ import numpy as np
 
 logger = logging.getLogger(__name__)
 
-class ProcessingPriority(Enum):
+class ProcessingPriority(IntEnum):
     CRITICAL = 1    # Emergency services, law enforcement
     HIGH = 2        # Healthcare, child services
     NORMAL = 3      # Standard government services
@@ -208,6 +209,8 @@ class WorkerPool:
         self.num_workers = num_workers
         self.max_queue_size = max_queue_size
         self.request_queue = PriorityQueue(maxsize=max_queue_size)
+        # Tie-breaker so equal priorities dequeue FIFO without comparing requests
+        self._sequence = itertools.count()
         self.result_callbacks = {}
         self.workers = []
         self.running = False
@@ -242,7 +245,7 @@ class WorkerPool:
         # Add poison pills to wake up workers
         for _ in range(self.num_workers):
             try:
-                self.request_queue.put((0, None), timeout=1)
+                self.request_queue.put((0, next(self._sequence), None), timeout=1)
             except:
                 pass
     
@@ -250,9 +253,8 @@ class WorkerPool:
                       callback: Callable[[ProcessingResult], None]) -> bool:
         """Submit a request for processing"""
         try:
-            # Priority queue uses tuple (priority, item)
-            priority_value = request.priority.value
-            self.request_queue.put((priority_value, request), timeout=1)
+            # Priority queue uses tuple (priority, sequence, item); priorities are ints
+            self.request_queue.put((request.priority, next(self._sequence), request), timeout=1)
             
             with self.lock:
                 self.result_callbacks[request.request_id] = callback
@@ -270,7 +272,7 @@ class WorkerPool:
         while self.running:
             try:
                 # Get next request
-                priority, request = self.request_queue.get(timeout=1)
+                priority, _, request = self.request_queue.get(timeout=1)
                 
                 if request is None:  # Poison pill
                     break
@@ -29,6 +29,7 @@ class ReportType(Enum):
     HOUSEHOLD_ANALYSIS = "household_analysis"
     SOURCE_SYSTEM_ANALYSIS = "source_system_analysis"
     COMPLIANCE_AUDIT = "compliance_audit"
+    EXECUTIVE_SUMMARY = "executive_summary"
     CUSTOM = "custom"
 
 class MetricType(Enum):
@@ -320,6 +321,59 @@ class ReportGenerator:
         else:
             raise ValueError(f"Unsupported report type: {report_type}")
     
+    async def generate_performance_report(self, days: int = 30) -> Report:
+        """System performance report over the last `days` days"""
+        period_end = datetime.now()
+        return await self.generate_report(
+            ReportType.SYSTEM_PERFORMANCE, period_end - timedelta(days=days), period_end
+        )
+    
+    async def generate_data_quality_report(self, days: int = 30) -> Report:
+        """Data quality report over the last `days` days"""
+        period_end = datetime.now()
+        return await self.generate_report(
+            ReportType.DATA_QUALITY, period_end - timedelta(days=days), period_end
+        )
+    
+    async def generate_matching_report(self, period_start: datetime, period_end: datetime) -> Report:
+        """Match accuracy report for the given period"""
+        return await self.generate_report(ReportType.MATCH_ACCURACY, period_start, period_end)
+    
+    async def generate_executive_report(self, days: int = 30) -> Report:
+        """Executive report combining the independent sub-reports for the last `days` days"""
+        period_end = datetime.now()
+        period_start = period_end - timedelta(days=days)
+        
+        # The sub-reports don't depend on each other, so build them concurrently
+        sub_reports = await asyncio.gather(*(
+            self.generate_report(report_type, period_start, period_end)
+            for report_type in (
+                ReportType.SYSTEM_PERFORMANCE,
+                ReportType.MATCH_ACCURACY,
+                ReportType.DATA_QUALITY,
+                ReportType.HOUSEHOLD_ANALYSIS,
+                ReportType.SOURCE_SYSTEM_ANALYSIS
+            )
+        ))
+        
+        return Report(
+            report_id=f"{ReportType.EXECUTIVE_SUMMARY.value}_{period_end.strftime('%Y%m%d_%H%M%S')}",
+            report_type=ReportType.EXECUTIVE_SUMMARY,
+            title=f"Executive Report ({period_start.strftime('%Y-%m-%d')} - {period_end.strftime('%Y-%m-%d')})",
+            generated_at=datetime.now(),
+            period_start=period_start,
+            period_end=period_end,
+            sections=[section for report in sub_reports for section in report.sections],
+            executive_summary=" ".join(report.executive_summary for report in sub_reports),
+            recommendations=list(dict.fromkeys(
+                recommendation for report in sub_reports for recommendation in report.recommendations
+            )),
+            data_sources=list(dict.fromkeys(
+                source for report in sub_reports for source in report.data_sources
+            )),
+            export_formats=["PDF", "Excel", "JSON"]
+        )
+    
     async def _generate_daily_summary_report(self, report_id: str, 
                                            period_start: datetime, period_end: datetime) -> Report:
         """Generate daily summary report"""
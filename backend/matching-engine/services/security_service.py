@@ -12,8 +12,10 @@ from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import base64
+import bisect
+import itertools
 import re
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 import asyncio
 import logging
 from enum import Enum
@@ -50,7 +52,10 @@ class SecurityService:
         self.encryption_key = self._generate_or_load_key()
         self.cipher_suite = Fernet(self.encryption_key)
         self.jwt_secret = secrets.token_urlsafe(32)
+        # Kept sorted by (timestamp, sequence); _event_keys is the index range queries bisect
         self.security_events = []
+        self._event_keys = []
+        self._event_sequence = itertools.count()
         self.failed_attempts = {}
         self.rate_limits = {}
         
@@ -296,12 +301,43 @@ class SecurityService:
     
     def generate_audit_log(self, start_date: datetime, end_date: datetime) -> List[Dict[str, Any]]:
         """Generate comprehensive audit log for compliance"""
-        filtered_events = [
-            event for event in self.security_events
-            if start_date <= event.timestamp <= end_date
-        ]
-        
-        return [asdict(event) for event in filtered_events]
+        lo, hi = self._event_range(start_date, end_date)
+        return [asdict(event) for event in self.security_events[lo:hi]]
+    
+    def query_audit_log(self, start_date: datetime, end_date: datetime, limit: int,
+                        cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str], int]:
+        """
+        One page of audit events in the range, newest first. Returns the events, the
+        cursor for the next (older) page or None on the last page, and the range total.
+        """
+        lo, hi = self._event_range(start_date, end_date)
+        hi_total = hi
+        if cursor:
+            hi = max(lo, min(hi, bisect.bisect_left(self._event_keys, self._decode_cursor(cursor))))
+        
+        start = max(lo, hi - limit)
+        page = [asdict(event) for event in reversed(self.security_events[start:hi])]
+        next_cursor = self._encode_cursor(self._event_keys[start]) if start > lo else None
+        return page, next_cursor, hi_total - lo
+    
+    def _event_range(self, start_date: datetime, end_date: datetime) -> Tuple[int, int]:
+        """Slice bounds of the events with start_date <= timestamp <= end_date"""
+        lo = bisect.bisect_left(self._event_keys, (start_date, -1))
+        hi = bisect.bisect_right(self._event_keys, (end_date, float('inf')))
+        return lo, hi
+    
+    @staticmethod
+    def _encode_cursor(key: Tuple[datetime, int]) -> str:
+        """Opaque keyset cursor: base64 of the (timestamp, sequence) key"""
+        timestamp, sequence = key
+        return base64.urlsafe_b64encode(f"{timestamp.isoformat()}_{sequence}".encode()).decode()
+    
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+        """Raises ValueError for a malformed cursor (binascii and decode errors included)"""
+        decoded = base64.urlsafe_b64decode(cursor.encode()).decode()
+        timestamp, _, sequence = decoded.rpartition("_")
+        return datetime.fromisoformat(timestamp), int(sequence)
     
     def _log_security_event(self, event_type: str, description: str, 
                            severity: SecurityLevel, user_id: str = "system",
@@ -320,7 +356,11 @@ class SecurityService:
             additional_data=additional_data or {}
         )
         
-        self.security_events.append(event)
+        # Timestamps arrive in order, so this is an append unless the clock steps back
+        key = (event.timestamp, next(self._event_sequence))
+        position = bisect.bisect_right(self._event_keys, key)
+        self._event_keys.insert(position, key)
+        self.security_events.insert(position, event)
         
         # Log to file for persistence
         self.logger.info(f"Security Event: {event_type} - {description}")
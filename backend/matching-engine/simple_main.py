@@ -1,11 +1,12 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 import time
 import random
 
-app = FastAPI(title="IDXR Matching Engine - Simple")
+app = FastAPI(title="IDXR Matching Engine - Simple", default_response_class=ORJSONResponse)
 
 # CORS configuration
 app.add_middleware(
@@ -63,7 +64,7 @@ async def resolve_identity(request: IdentityResolutionRequest):
         start_time = time.time()
         
         # Get demographic data
-        demo_data = request.demographic_data.dict(exclude_none=True)
+        demo_data = request.demographic_data.model_dump(exclude_none=True)
         
         # Mock matches based on input data
         matches = []
@@ -0,0 +1,117 @@
+"""
+Adaptive micro-batching for request handlers
+Coalesces items submitted within a short window into one handler call per group key
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Hashable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+BatchHandler = Callable[[Hashable, List[Any]], Awaitable[List[Any]]]
+
+class MicroBatcher:
+    """
+    Collects submitted items until max_batch items are queued or window_ms elapses after
+    the first one, then calls handler(key, items) once per group key. The handler must
+    return one result per item, in order; each submitter's future resolves to its result.
+    """
+    
+    def __init__(self, handler: BatchHandler, max_batch: int = 48, window_ms: float = 10):
+        self.handler = handler
+        self.max_batch = max_batch
+        self.window = window_ms / 1000.0
+        self._queue: Optional[asyncio.Queue] = None
+        self._consumer: Optional[asyncio.Task] = None
+        self._dispatches = set()
+    
+    def start(self):
+        """Start the consumer task; must be called from the running event loop"""
+        self._queue = asyncio.Queue()
+        self._consumer = asyncio.create_task(self._consume())
+    
+    async def stop(self):
+        """
+        Stop the consumer. Batches already handed to the handler finish; items still
+        waiting for a batch fail with RuntimeError instead of hanging their submitters.
+        """
+        if self._consumer:
+            self._consumer.cancel()
+            try:
+                await self._consumer
+            except asyncio.CancelledError:
+                pass
+            self._consumer = None
+        
+        if self._queue is not None:
+            while not self._queue.empty():
+                _, _, future = self._queue.get_nowait()
+                self._fail(future)
+            self._queue = None
+        
+        if self._dispatches:
+            await asyncio.gather(*self._dispatches, return_exceptions=True)
+    
+    async def submit(self, key: Hashable, item: Any) -> Any:
+        """Queue an item under a group key and wait for its result"""
+        if self._consumer is None:
+            raise RuntimeError("MicroBatcher is not running; call start() before submit()")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((key, item, future))
+        return await future
+    
+    async def _consume(self):
+        loop = asyncio.get_running_loop()
+        batch = []
+        
+        try:
+            while True:
+                batch = [await self._queue.get()]
+                deadline = loop.time() + self.window
+                
+                while len(batch) < self.max_batch:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                
+                # Entries sharing a key share configuration and are handled in one call
+                groups = defaultdict(list)
+                for key, item, future in batch:
+                    groups[key].append((item, future))
+                batch = []
+                
+                # Dispatch without blocking the next collection window
+                for key, entries in groups.items():
+                    task = asyncio.create_task(self._dispatch(key, entries))
+                    self._dispatches.add(task)
+                    task.add_done_callback(self._dispatches.discard)
+        except asyncio.CancelledError:
+            # Stopped while collecting a window; its items never reach the handler
+            for _, _, future in batch:
+                self._fail(future)
+            raise
+    
+    @staticmethod
+    def _fail(future: asyncio.Future):
+        if not future.done():
+            future.set_exception(RuntimeError("MicroBatcher stopped before the item was handled"))
+    
+    async def _dispatch(self, key: Hashable, entries: List):
+        try:
+            results = await self.handler(key, [item for item, _ in entries])
+        except Exception as e:
+            logger.error(f"Micro-batch handler failed for {len(entries)} items: {str(e)}")
+            for _, future in entries:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, future), result in zip(entries, results):
+            if not future.done():
+                future.set_result(result)
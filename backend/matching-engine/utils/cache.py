@@ -1,7 +1,8 @@
 import json
 import asyncio
 import os
-from typing import Any, Optional
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set
 
 class CacheManager:
     def __init__(self):
@@ -9,6 +10,8 @@ class CacheManager:
         self.port = os.getenv('REDIS_PORT', '6379')
         # In-memory cache for demo
         self.cache = {}
+        # Monotonic deadlines for keys written with an expiry, mirroring Redis EX
+        self.expires_at = {}
     
     async def check_connection(self) -> bool:
         # For demo, always return True
@@ -16,8 +19,15 @@ class CacheManager:
         await asyncio.sleep(0.01)  # Simulate connection check
         return True
     
+    def _evict_if_expired(self, key: str) -> None:
+        deadline = self.expires_at.get(key)
+        if deadline is not None and deadline <= time.monotonic():
+            self.cache.pop(key, None)
+            del self.expires_at[key]
+    
     async def get(self, key: str) -> Optional[Any]:
         # In production, get from Redis
+        self._evict_if_expired(key)
         value = self.cache.get(key)
         if value and isinstance(value, str):
             try:
@@ -26,17 +36,122 @@ class CacheManager:
                 return value
         return value
     
+    async def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        # In production, a single MGET round trip; values come back in key order
+        return [await self.get(key) for key in keys]
+    
+    async def get_bytes(self, key: str) -> Optional[bytes]:
+        # Pre-encoded payloads are returned untouched so callers can write them straight to the response
+        self._evict_if_expired(key)
+        value = self.cache.get(key)
+        return value if isinstance(value, bytes) else None
+    
     async def set(self, key: str, value: Any, expire: int = 300) -> bool:
         # In production, set in Redis with expiration
         if isinstance(value, (dict, list)):
             self.cache[key] = json.dumps(value)
         else:
             self.cache[key] = value
+        self.expires_at[key] = time.monotonic() + expire
+        return True
+    
+    async def set_bytes(self, key: str, value: bytes, expire: int = 300) -> bool:
+        # In production, SET in Redis with expiration; no JSON round-trip on either side
+        self.cache[key] = value
+        self.expires_at[key] = time.monotonic() + expire
+        return True
+    
+    async def set_nx(self, key: str, value: Any, expire: int = 300) -> bool:
+        # In production, SET key value NX EX <expire>; True only for the caller that created the key
+        self._evict_if_expired(key)
+        if key in self.cache:
+            return False
+        self.cache[key] = value
+        self.expires_at[key] = time.monotonic() + expire
+        return True
+    
+    async def hset(self, key: str, mapping: Dict[str, Any], expire: int = 300) -> bool:
+        # In production, HSET key field value [...] + EXPIRE in one pipeline
+        self.cache[key] = dict(mapping)
+        self.expires_at[key] = time.monotonic() + expire
         return True
     
+    async def hgetall(self, key: str) -> Dict[str, Any]:
+        # In production, HGETALL against Redis; an empty dict when the key is missing
+        self._evict_if_expired(key)
+        value = self.cache.get(key)
+        return dict(value) if isinstance(value, dict) else {}
+    
+    async def sadd(self, key: str, *members: str, expire: Optional[int] = None) -> int:
+        # In production, SADD against Redis; with expire, EXPIRE NX + EXPIRE GT in the same
+        # pipeline so the set's TTL only ever grows to cover its longest-lived member
+        self._evict_if_expired(key)
+        existing = self.cache.setdefault(key, set())
+        before = len(existing)
+        existing.update(members)
+        if expire is not None:
+            deadline = time.monotonic() + expire
+            self.expires_at[key] = max(self.expires_at.get(key, deadline), deadline)
+        return len(existing) - before
+    
+    async def smembers(self, key: str) -> Set[str]:
+        # In production, SMEMBERS against Redis
+        self._evict_if_expired(key)
+        members = self.cache.get(key)
+        return set(members) if isinstance(members, set) else set()
+    
+    async def sunion(self, keys: Iterable[str]) -> Set[str]:
+        # In production, a single SUNION across all keys
+        result = set()
+        for key in keys:
+            members = self.cache.get(key)
+            if isinstance(members, set):
+                result |= members
+        return result
+    
+    async def record_request(self, success: bool, confidence: float, response_ms: int,
+                             cache_hit: bool = False) -> None:
+        # In production, one MULTI/EXEC pipeline so the counters update atomically in a single RTT:
+        #   INCR stats:total_requests
+        #   INCR stats:successful_matches            (only when success)
+        #   INCR stats:cache_hits                    (only when cache_hit)
+        #   HINCRBYFLOAT stats:confidence_sum total <confidence>
+        #   HINCRBYFLOAT stats:response_ms_sum total <response_ms>
+        self.cache['stats:total_requests'] = self.cache.get('stats:total_requests', 0) + 1
+        if success:
+            self.cache['stats:successful_matches'] = self.cache.get('stats:successful_matches', 0) + 1
+        if cache_hit:
+            self.cache['stats:cache_hits'] = self.cache.get('stats:cache_hits', 0) + 1
+        confidence_sum = self.cache.setdefault('stats:confidence_sum', {'total': 0.0})
+        confidence_sum['total'] += confidence
+        response_ms_sum = self.cache.setdefault('stats:response_ms_sum', {'total': 0.0})
+        response_ms_sum['total'] += response_ms
+    
+    async def get_request_stats(self) -> Dict[str, float]:
+        # In production, one pipeline: MGET of the plain counters plus the two HGETs
+        total_requests, successful_matches, cache_hits = await self.mget(
+            ['stats:total_requests', 'stats:successful_matches', 'stats:cache_hits']
+        )
+        return {
+            'total_requests': total_requests or 0,
+            'successful_matches': successful_matches or 0,
+            'cache_hit_rate': (cache_hits or 0) / total_requests if total_requests else 0,
+            'confidence_sum': self.cache.get('stats:confidence_sum', {}).get('total', 0.0),
+            'response_ms_sum': self.cache.get('stats:response_ms_sum', {}).get('total', 0.0)
+        }
+    
+    async def delete_prefix(self, prefix: str) -> int:
+        # In production, SCAN MATCH "<prefix>*" + UNLINK in batches
+        keys = [key for key in self.cache if key.startswith(prefix)]
+        for key in keys:
+            del self.cache[key]
+            self.expires_at.pop(key, None)
+        return len(keys)
+    
     async def delete(self, key: str) -> bool:
         # In production, delete from Redis
         if key in self.cache:
             del self.cache[key]
+            self.expires_at.pop(key, None)
             return True
         return False
\ No newline at end of file
@@ -34,7 +34,9 @@ DATABASE_CONFIG = {
     'pool_size': int(os.getenv('DB_POOL_SIZE', 20)),
     'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 30)),
     'pool_timeout': int(os.getenv('DB_POOL_TIMEOUT', 30)),
-    'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', 3600))
+    'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', 3600)),
+    'pool_min_size': int(os.getenv('DB_POOL_MIN_SIZE', 10)),
+    'pool_max_size': int(os.getenv('DB_POOL_MAX_SIZE', 50))
 }
 
 # SQLAlchemy Base
@@ -263,8 +265,10 @@ class DatabaseConnection:
                 database=DATABASE_CONFIG['database'],
                 user=DATABASE_CONFIG['user'],
                 password=DATABASE_CONFIG['password'],
-                min_size=5,
-                max_size=DATABASE_CONFIG['pool_size'],
+                min_size=DATABASE_CONFIG['pool_min_size'],
+                max_size=DATABASE_CONFIG['pool_max_size'],
+                max_queries=50000,
+                max_inactive_connection_lifetime=300,
                 command_timeout=60
             )
             
@@ -275,6 +279,26 @@ class DatabaseConnection:
             self.logger.error(f"Failed to initialize connection pool: {str(e)}")
             return False
     
+    async def close_connection_pool(self):
+        """Close the asyncpg connection pool"""
+        if self._connection_pool:
+            await self._connection_pool.close()
+            self._connection_pool = None
+            self.logger.info("AsyncPG connection pool closed")
+    
+    @asynccontextmanager
+    async def acquire(self):
+        """Acquire a pooled connection; concurrent callers each get their own"""
+        if self.demo_mode:
+            yield MockAsyncConnection()
+            return
+        
+        if not self._connection_pool:
+            await self.initialize_connection_pool()
+        
+        async with self._connection_pool.acquire() as conn:
+            yield conn
+    
     async def check_connection(self) -> bool:
         """Check database connectivity"""
         if self.demo_mode:
@@ -377,6 +401,21 @@ class MockAsyncSession:
     async def execute(self, stmt):
         return MockResult([])
 
+class MockAsyncConnection:
+    """Mock asyncpg connection for demo mode"""
+    
+    async def fetchval(self, query, *args):
+        return 1
+    
+    async def fetch(self, query, *args):
+        return []
+    
+    async def fetchrow(self, query, *args):
+        return None
+    
+    async def execute(self, query, *args):
+        return "OK"
+
 class MockSyncSession:
     """Mock sync session for demo mode"""
     
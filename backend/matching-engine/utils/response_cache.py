@@ -0,0 +1,138 @@
+"""
+Cached JSON responses for read-mostly endpoints
+Entries are pre-encoded bodies stored as cache hashes with the time they go stale.
+Freshness is sized per endpoint by a CachePolicy from how long the handler took.
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable
+
+import orjson
+from fastapi.responses import Response
+
+from utils.cache import CacheManager
+
+logger = logging.getLogger(__name__)
+
+# Same options ORJSONResponse uses; matcher scores may be NumPy scalars
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """
+    Freshness window for a cached endpoint. The TTL is the handler's measured latency
+    plus buffer, clamped to [min_ttl, max_ttl], so slower responses stay cached longer.
+    With fallback, the last body is kept for stale_ttl after it goes stale and is served
+    when the handler raises. Within stale_while_revalidate seconds of going stale, the
+    stale body is served immediately while one background task refreshes it.
+    """
+    min_ttl: float
+    max_ttl: float
+    buffer: float = 0.0
+    fallback: bool = False
+    stale_ttl: int = 3600
+    stale_while_revalidate: float = 0.0
+    
+    def ttl(self, elapsed: float) -> float:
+        return min(max(elapsed + self.buffer, self.min_ttl), self.max_ttl)
+
+SHORT = CachePolicy(min_ttl=1, max_ttl=10, buffer=1)
+NORMAL = CachePolicy(min_ttl=10, max_ttl=30, buffer=10)
+LONG = CachePolicy(min_ttl=30, max_ttl=300, buffer=30)
+STATIC = CachePolicy(min_ttl=3600, max_ttl=3600)
+
+def json_response(body: bytes, cache_status: str) -> Response:
+    return Response(content=body, media_type="application/json", headers={"X-Cache": cache_status})
+
+class ResponseCache:
+    """Serves compute()'s JSON-encoded result from the cache according to a CachePolicy"""
+    
+    def __init__(self, cache: CacheManager):
+        self.cache = cache
+        # Background refreshes, referenced until they finish
+        self._refreshes = set()
+    
+    async def respond(self, key: str, policy: CachePolicy, compute: Callable[[], Any],
+                      tags: Iterable[str] = ()) -> Response:
+        """
+        compute may be sync or async; it runs only when the entry is missing or stale.
+        Tagged entries are dropped by invalidate_tag.
+        """
+        entry = await self.cache.hgetall(key)
+        if entry:
+            now = time.time()
+            if entry['stale_at'] > now:
+                return json_response(entry['body'], "HIT")
+            if now < entry['stale_at'] + policy.stale_while_revalidate:
+                await self._revalidate(key, policy, compute, tags)
+                return json_response(entry['body'], "STALE")
+        
+        try:
+            body, elapsed = await self._compute(compute)
+        except Exception as e:
+            if policy.fallback and entry:
+                logger.warning(f"Serving stale {key} after handler failure: {str(e)}")
+                return json_response(entry['body'], "STALE")
+            raise
+        
+        await self.store(key, policy, body, elapsed, tags)
+        return json_response(body, "MISS")
+    
+    async def invalidate_tag(self, tag: str) -> int:
+        """Drop every entry stored under tag; one set read instead of a key scan"""
+        tag_key = f"tag:{tag}"
+        keys = await self.cache.smembers(tag_key)
+        for key in keys:
+            await self.cache.delete(key)
+        await self.cache.delete(tag_key)
+        return len(keys)
+    
+    async def store(self, key: str, policy: CachePolicy, body: bytes, elapsed: float,
+                    tags: Iterable[str] = ()) -> None:
+        now = time.time()
+        ttl = policy.ttl(elapsed)
+        # Entries outlive their freshness by the revalidation window, and by stale_ttl
+        # for fallback, so there is something to serve meanwhile
+        stale_for = max(policy.stale_while_revalidate, policy.stale_ttl if policy.fallback else 1)
+        expire = int(ttl + stale_for)
+        await self.cache.hset(
+            key,
+            {'body': body, 'generated_at': now, 'stale_at': now + ttl},
+            expire=expire
+        )
+        # A tag set lives as long as its longest-lived entry, so sets for tags that are
+        # never invalidated don't accumulate forever
+        for tag in tags:
+            await self.cache.sadd(f"tag:{tag}", key, expire=expire)
+    
+    async def _revalidate(self, key: str, policy: CachePolicy, compute: Callable[[], Any],
+                          tags: Iterable[str]) -> None:
+        # The NX lock lets a single request (across workers) rebuild the entry
+        lock_key = f"{key}:refresh"
+        if not await self.cache.set_nx(lock_key, 1, expire=max(int(policy.max_ttl), 30)):
+            return
+        
+        async def refresh():
+            try:
+                body, elapsed = await self._compute(compute)
+                await self.store(key, policy, body, elapsed, tags)
+            except Exception as e:
+                logger.warning(f"Background refresh of {key} failed: {str(e)}")
+            finally:
+                await self.cache.delete(lock_key)
+        
+        task = asyncio.create_task(refresh())
+        self._refreshes.add(task)
+        task.add_done_callback(self._refreshes.discard)
+    
+    async def _compute(self, compute: Callable[[], Any]):
+        start = time.perf_counter()
+        result = compute()
+        if inspect.isawaitable(result):
+            result = await result
+        body = orjson.dumps(result, option=ORJSON_OPTIONS)
+        return body, time.perf_counter() - start